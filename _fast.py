@@ -0,0 +1,200 @@
+"""
+Numba-accelerated numeric kernels for hot data-processing paths.
+
+The kernels operate on raw float64 ndarrays so the JIT'd loops run as
+single fused passes without pandas dispatch. When numba is not installed
+the callers fall back to their vectorized numpy paths (check HAVE_NUMBA).
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:
+    njit = None
+    prange = range
+    HAVE_NUMBA = False
+
+
+def _jit(func):
+    """Apply numba JIT when available, otherwise leave the function as-is."""
+    if njit is None:
+        return func
+    return njit(cache=True, fastmath=True)(func)
+
+
+def _jit_sig(signature):
+    """Like _jit but with an explicit signature.
+
+    A declared signature makes numba compile at import instead of on
+    first call, so one-shot runs don't pay the JIT latency; it also pins
+    the C-contiguous float64 layout.
+    """
+    if njit is None:
+        return lambda func: func
+    return njit(signature, cache=True, fastmath=True)
+
+
+@_jit
+def _trend_core(close, short_period, long_period):
+    """Fused tail-mean pass for trend analysis.
+
+    Returns (trend_code, strength, short_ma, long_ma) where trend_code is
+    1 = bullish, -1 = bearish, 0 = sideways.
+    """
+    n = close.shape[0]
+    short_sum = 0.0
+    long_sum = 0.0
+    for i in range(n - long_period, n):
+        long_sum += close[i]
+    for i in range(n - short_period, n):
+        short_sum += close[i]
+    short_ma = short_sum / short_period
+    long_ma = long_sum / long_period
+    current = close[n - 1]
+
+    if current > short_ma and short_ma > long_ma:
+        strength = (current - long_ma) / long_ma * 1000.0
+        if strength > 100.0:
+            strength = 100.0
+        return 1, strength, short_ma, long_ma
+    if current < short_ma and short_ma < long_ma:
+        strength = (long_ma - current) / long_ma * 1000.0
+        if strength > 100.0:
+            strength = 100.0
+        return -1, strength, short_ma, long_ma
+    return 0, 50.0, short_ma, long_ma
+
+
+@_jit
+def _drawdown_core(close):
+    """Fused running-max pass returning (max_drawdown, current_drawdown) in %."""
+    running_max = close[0]
+    max_dd = 0.0
+    dd = 0.0
+    for i in range(close.shape[0]):
+        if close[i] > running_max:
+            running_max = close[i]
+        dd = (close[i] - running_max) / running_max * 100.0
+        if dd < max_dd:
+            max_dd = dd
+    return max_dd, dd
+
+
+@_jit
+def _rsi_kernel(close, period):
+    """Single-pass RSI with Wilder's smoothing; returns the final value."""
+    n = close.shape[0]
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, period + 1):
+        delta = close[i] - close[i - 1]
+        if delta > 0.0:
+            avg_gain += delta
+        else:
+            avg_loss -= delta
+    avg_gain /= period
+    avg_loss /= period
+    for i in range(period + 1, n):
+        delta = close[i] - close[i - 1]
+        gain = delta if delta > 0.0 else 0.0
+        loss = -delta if delta < 0.0 else 0.0
+        avg_gain = (avg_gain * (period - 1) + gain) / period
+        avg_loss = (avg_loss * (period - 1) + loss) / period
+    if avg_loss == 0.0:
+        return 100.0
+    rs = avg_gain / avg_loss
+    return 100.0 - 100.0 / (1.0 + rs)
+
+
+@_jit_sig('UniTuple(float64, 3)(float64[::1], int64, int64, float64)')
+def _stats_kernel(close, rsi_period, vol_period, rf_daily):
+    """One traversal of Close producing (volatility, sharpe, rsi).
+
+    Fuses the three per-indicator passes: Welford mean/variance of excess
+    returns for the Sharpe ratio, a tail-window variance for volatility
+    and Wilder-smoothed RSI. Annualization factors are applied here.
+    """
+    n = close.shape[0]
+    m = n - 1  # number of daily returns
+
+    # Sharpe: running mean/variance of excess returns (Welford)
+    mean = 0.0
+    m2 = 0.0
+    for i in range(1, n):
+        r = close[i] / close[i - 1] - 1.0 - rf_daily
+        delta = r - mean
+        mean += delta / i
+        m2 += delta * (r - mean)
+    sharpe = 0.0
+    if m > 1:
+        std = (m2 / (m - 1)) ** 0.5
+        if std > 0.0:
+            sharpe = mean / std * 252.0 ** 0.5
+
+    # Volatility over the last vol_period returns
+    w = vol_period if vol_period < m else m
+    vol = 0.0
+    if w > 1:
+        vmean = 0.0
+        for i in range(n - w, n):
+            vmean += close[i] / close[i - 1] - 1.0
+        vmean /= w
+        vvar = 0.0
+        for i in range(n - w, n):
+            d = close[i] / close[i - 1] - 1.0 - vmean
+            vvar += d * d
+        vol = (vvar / (w - 1)) ** 0.5 * 252.0 ** 0.5 * 100.0
+
+    # RSI with Wilder's smoothing
+    rsi = 50.0
+    if m >= rsi_period:
+        avg_gain = 0.0
+        avg_loss = 0.0
+        for i in range(1, rsi_period + 1):
+            delta = close[i] - close[i - 1]
+            if delta > 0.0:
+                avg_gain += delta
+            else:
+                avg_loss -= delta
+        avg_gain /= rsi_period
+        avg_loss /= rsi_period
+        for i in range(rsi_period + 1, n):
+            delta = close[i] - close[i - 1]
+            gain = delta if delta > 0.0 else 0.0
+            loss = -delta if delta < 0.0 else 0.0
+            avg_gain = (avg_gain * (rsi_period - 1) + gain) / rsi_period
+            avg_loss = (avg_loss * (rsi_period - 1) + loss) / rsi_period
+        if avg_loss == 0.0:
+            rsi = 100.0
+        else:
+            rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+    return vol, sharpe, rsi
+
+
+def _jit_parallel(func):
+    """Apply numba JIT with parallel=True so prange loops use threads."""
+    if njit is None:
+        return func
+    return njit(cache=True, fastmath=True, parallel=True)(func)
+
+
+@_jit_parallel
+def _batch_stats(closes, rsi_period, vol_period, rf_daily):
+    """Fused stats across a 2D [n_symbols, n_days] close matrix.
+
+    Each row runs through _stats_kernel on its own thread via prange,
+    bypassing the GIL, so the compute stage scales with core count.
+    Returns (vol, sharpe, rsi) arrays indexed like the input rows.
+    """
+    n = closes.shape[0]
+    vol = np.empty(n, dtype=np.float64)
+    sharpe = np.empty(n, dtype=np.float64)
+    rsi = np.empty(n, dtype=np.float64)
+    for i in prange(n):
+        vol[i], sharpe[i], rsi[i] = _stats_kernel(
+            closes[i], rsi_period, vol_period, rf_daily
+        )
+    return vol, sharpe, rsi
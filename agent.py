@@ -1,17 +1,13 @@
 import streamlit as st
-import yfinance as yf
-import pandas as pd
+from collections import deque
 from datetime import datetime, timedelta
-from agno.agent import Agent
-from agno.run.agent import RunOutput
-from agno.models.openai import OpenAIChat
-from agno.tools.yfinance import YFinanceTools
-import plotly.graph_objects as go
-import plotly.express as px
+from concurrent.futures import ThreadPoolExecutor
 from utils import validate_stock_symbol, format_currency, calculate_percentage_change
-from config import DEFAULT_MODEL, DEFAULT_ANALYSIS_DAYS
+from config import (DEFAULT_MODEL, DEFAULT_ANALYSIS_DAYS, CACHE_DURATION,
+                    MAX_HISTORY_ITEMS, SESSION_HISTORY_MAXLEN, AGENT_DESCRIPTION,
+                    AGENT_INSTRUCTIONS, DEBUG_MODE)
 from logger import logger
-from persistence import save_analysis_history, load_analysis_history, get_history_stats
+from persistence import append_analysis_entry, load_analysis_history, get_history_stats
 from export import export_analysis_history, export_comparison_table, get_export_list
 from error_handler import get_user_friendly_error_message, safe_execute
 from performance import PerformanceTimer, get_performance_stats
@@ -49,11 +45,272 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
+
+@st.cache_resource(show_spinner=False)
+def yf_session():
+    """One pooled requests.Session shared by every yfinance call.
+
+    Reusing the session keeps connections alive across tickers instead of
+    paying a TLS handshake per request.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    session.mount('https://', HTTPAdapter(pool_connections=16, pool_maxsize=32))
+    return session
+
+
+@st.cache_resource(show_spinner=False)
+def _openai_http_client():
+    """One pooled httpx client reused by every OpenAI call."""
+    import httpx
+
+    return httpx.Client(
+        limits=httpx.Limits(max_connections=10, max_keepalive_connections=5)
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def _build_agent(api_key: str, model: str):
+    """Build the AI agent once per (api_key, model) and reuse it across reruns."""
+    # Deferred imports: agno pulls in the OpenAI client stack, which is
+    # only needed once an API key is set
+    from agno.agent import Agent
+    from agno.models.openai import OpenAIChat
+    from agno.tools.yfinance import YFinanceTools
+
+    return Agent(
+        model=OpenAIChat(id=model, api_key=api_key, http_client=_openai_http_client()),
+        tools=[
+            YFinanceTools(
+                stock_price=True,
+                analyst_recommendations=True,
+                stock_fundamentals=True
+            )
+        ],
+        debug_mode=DEBUG_MODE,
+        description=AGENT_DESCRIPTION,
+        instructions=list(AGENT_INSTRUCTIONS),
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def _get_ticker(symbol: str):
+    """Return a cached yfinance Ticker so reruns reuse the same object."""
+    import yfinance as yf  # deferred: only loaded on the first data fetch
+
+    return yf.Ticker(symbol, session=yf_session())
+
+
+@st.cache_data(ttl=CACHE_DURATION, show_spinner=False)
+def get_info(symbol: str) -> dict:
+    """Fetch ticker info once per TTL window instead of on every rerun."""
+    return _get_ticker(symbol).info
+
+
+@st.cache_data(ttl=CACHE_DURATION, show_spinner=False)
+def get_history(symbol: str, period: str):
+    """Fetch historical price data once per (symbol, period) per TTL window."""
+    return _get_ticker(symbol).history(period=period)
+
+
+@st.cache_data(ttl=CACHE_DURATION, show_spinner=False)
+def get_history_pair(symbol1: str, symbol2: str, period: str):
+    """Download both symbols' history in one batched yfinance request."""
+    import yfinance as yf  # deferred: only loaded on the first data fetch
+
+    data = yf.download(
+        [symbol1, symbol2],
+        period=period,
+        group_by='ticker',
+        threads=True,
+        progress=False,
+        session=yf_session()
+    )
+    return data[symbol1].dropna(how='all'), data[symbol2].dropna(how='all')
+
+
+@st.cache_data(ttl=CACHE_DURATION, show_spinner=False)
+def get_recommendations(symbol: str):
+    """Fetch analyst recommendations once per symbol per TTL window."""
+    return _get_ticker(symbol).recommendations
+
+
+def fetch_pair(fetch_fn, *symbols):
+    """Run an I/O-bound fetch for several symbols in parallel threads."""
+    with ThreadPoolExecutor(max_workers=len(symbols)) as executor:
+        return list(executor.map(fetch_fn, symbols))
+
+
+# Fundamentals table: (label, info key, formatter) — one source of truth for both columns
+METRIC_SPECS = [
+    ('Current Price', 'currentPrice', format_currency),
+    ('Market Cap', 'marketCap', format_currency),
+    ('P/E Ratio', 'trailingPE', str),
+    ('Forward P/E', 'forwardPE', str),
+    ('Dividend Yield', 'dividendYield', lambda v: f"{v * 100:.2f}%"),
+    ('52 Week High', 'fiftyTwoWeekHigh', format_currency),
+    ('52 Week Low', 'fiftyTwoWeekLow', format_currency),
+    ('Beta', 'beta', str),
+    ('Revenue Growth', 'revenueGrowth', str),
+    ('Profit Margin', 'profitMargins', lambda v: f"{v * 100:.2f}%"),
+]
+
+
+def build_metric_column(info: dict) -> list:
+    """Format one stock's info dict into a Fundamentals table column."""
+    column = []
+    for _, key, formatter in METRIC_SPECS:
+        value = info.get(key)
+        if key == 'currentPrice' and value is None:
+            value = info.get('regularMarketPrice')
+        column.append(formatter(value) if value is not None else 'N/A')
+    return column
+
+
+def downsample(series, max_points: int = 500):
+    """Stride-sample a series down to at most max_points for plotting.
+
+    For 5Y/MAX periods each series has 1000+ daily points; the plotly JSON
+    sent to the browser is O(N), so this keeps chart payloads small with no
+    visible degradation.
+    """
+    step = max(1, len(series) // max_points)
+    return series.iloc[::step]
+
+
+@st.cache_data(ttl=CACHE_DURATION, show_spinner=False)
+def build_price_figure(symbol1: str, symbol2: str, period: str):
+    """Build the price comparison figure, cached so tab switches are free."""
+    import plotly.graph_objects as go  # deferred: only the Charts tab needs plotly
+
+    hist1, hist2 = get_history_pair(symbol1, symbol2, period)
+    if hist1.empty or hist2.empty:
+        return None
+
+    close1 = downsample(hist1['Close'])
+    close2 = downsample(hist2['Close'])
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=close1.index,
+        y=close1,
+        mode='lines',
+        name=symbol1,
+        line=dict(color='#1f77b4', width=2)
+    ))
+    fig.add_trace(go.Scatter(
+        x=close2.index,
+        y=close2,
+        mode='lines',
+        name=symbol2,
+        line=dict(color='#ff7f0e', width=2)
+    ))
+    fig.update_layout(
+        title=f"Price Comparison: {symbol1} vs {symbol2}",
+        xaxis_title="Date",
+        yaxis_title="Price ($)",
+        hovermode='x unified',
+        height=500,
+        template="plotly_white"
+    )
+    return fig
+
+
+@st.cache_data(ttl=CACHE_DURATION, show_spinner=False)
+def build_volume_figure(symbol1: str, symbol2: str, period: str):
+    """Build the volume comparison figure, cached so tab switches are free."""
+    import plotly.graph_objects as go  # deferred: only the Charts tab needs plotly
+
+    hist1, hist2 = get_history_pair(symbol1, symbol2, period)
+    if hist1.empty or hist2.empty:
+        return None
+
+    volume1 = downsample(hist1['Volume'])
+    volume2 = downsample(hist2['Volume'])
+
+    fig_vol = go.Figure()
+    fig_vol.add_trace(go.Bar(
+        x=volume1.index,
+        y=volume1,
+        name=symbol1,
+        marker_color='#1f77b4',
+        opacity=0.7
+    ))
+    fig_vol.add_trace(go.Bar(
+        x=volume2.index,
+        y=volume2,
+        name=symbol2,
+        marker_color='#ff7f0e',
+        opacity=0.7
+    ))
+    fig_vol.update_layout(
+        title="Trading Volume Comparison",
+        xaxis_title="Date",
+        yaxis_title="Volume",
+        barmode='group',
+        height=400,
+        template="plotly_white"
+    )
+    return fig_vol
+
+
+@st.cache_data(ttl=CACHE_DURATION, show_spinner=False)
+def build_fundamentals_table(symbol1: str, symbol2: str) -> dict:
+    """Build the fundamentals comparison table, cached so tab switches are free."""
+    info1, info2 = fetch_pair(get_info, symbol1, symbol2)
+    return {
+        'Metric': [spec[0] for spec in METRIC_SPECS],
+        symbol1: build_metric_column(info1),
+        symbol2: build_metric_column(info2)
+    }
+
+
+@st.fragment
+def quick_stats(stock1: str, stock2: str):
+    """Quick Stats metric cards, isolated so symbol edits rerun only this block."""
+    st.subheader("📊 Quick Stats")
+    quick_cols = st.columns(max(2, len([s for s in [stock1, stock2] if s])))
+
+    for idx, stock in enumerate([stock1, stock2]):
+        if stock and validate_stock_symbol(stock):
+            try:
+                info = get_info(stock)
+                current_price = info.get('currentPrice', info.get('regularMarketPrice', 'N/A'))
+
+                with quick_cols[idx]:
+                    st.metric(
+                        label=f"{stock}",
+                        value=format_currency(current_price) if isinstance(current_price, (int, float)) else current_price,
+                        delta=f"{info.get('regularMarketChangePercent', 0):.2f}%" if 'regularMarketChangePercent' in info else None
+                    )
+            except Exception as e:
+                st.error(f"Error fetching data for {stock}: {str(e)}")
+
+
+@st.fragment
+def recent_analyses():
+    """Recent Analyses expanders, isolated from full-script reruns."""
+    st.subheader("📚 Recent Analyses")
+    if st.session_state.analysis_history:
+        for i, analysis in enumerate(reversed(list(st.session_state.analysis_history)[-5:])):
+            with st.expander(f"{analysis['timestamp']} - {analysis['stocks']}"):
+                st.write(f"**Type:** {analysis['type']}")
+                if st.button(f"View", key=f"view_{i}"):
+                    st.session_state.selected_analysis = analysis
+    else:
+        st.info("No analysis history yet")
+
+
 # Initialize session state
 if 'analysis_history' not in st.session_state:
-    # Load history from persistence
-    st.session_state.analysis_history = load_analysis_history()
-    logger.info(f"Loaded {len(st.session_state.analysis_history)} analysis history entries")
+    # Load history from persistence into a bounded ring buffer so session
+    # memory stays constant no matter how many analyses are run; the bound
+    # is a retention limit, distinct from the MAX_HISTORY_ITEMS display cap
+    persisted_history = load_analysis_history()
+    st.session_state.analysis_history = deque(persisted_history, maxlen=SESSION_HISTORY_MAXLEN)
+    logger.info(f"Loaded {len(persisted_history)} analysis history entries")
 if 'api_key_set' not in st.session_state:
     st.session_state.api_key_set = False
 if 'performance_stats' not in st.session_state:
@@ -92,15 +349,7 @@ with st.sidebar:
     
     st.divider()
     
-    st.subheader("📚 Recent Analyses")
-    if st.session_state.analysis_history:
-        for i, analysis in enumerate(reversed(st.session_state.analysis_history[-5:])):
-            with st.expander(f"{analysis['timestamp']} - {analysis['stocks']}"):
-                st.write(f"**Type:** {analysis['type']}")
-                if st.button(f"View", key=f"view_{i}"):
-                    st.session_state.selected_analysis = analysis
-    else:
-        st.info("No analysis history yet")
+    recent_analyses()
     
     st.divider()
     
@@ -108,7 +357,8 @@ with st.sidebar:
     st.subheader("💾 Export & Management")
     if st.button("📥 Export History", use_container_width=True):
         try:
-            export_path = export_analysis_history(st.session_state.analysis_history, format="json")
+            # Export everything on disk, not just the session ring buffer
+            export_path = export_analysis_history(load_analysis_history(), format="json")
             st.success(f"✅ History exported to: {export_path}")
         except Exception as e:
             st.error(f"Export failed: {get_user_friendly_error_message(e)}")
@@ -139,26 +389,9 @@ if not st.session_state.api_key_set:
     - 📚 Analysis history tracking
     """)
 else:
-    # Initialize agent
+    # Initialize agent (cached across reruns)
     try:
-        assistant = Agent(
-            model=OpenAIChat(id=DEFAULT_MODEL, api_key=openai_api_key),
-            tools=[
-                YFinanceTools(
-                    stock_price=True, 
-                    analyst_recommendations=True, 
-                    stock_fundamentals=True
-                )
-            ],
-            debug_mode=True,
-            description="You are an expert investment analyst that researches stock prices, analyst recommendations, and stock fundamentals. Provide detailed, actionable insights.",
-            instructions=[
-                "Format your response using markdown and use tables to display data where possible.",
-                "Include specific numbers, percentages, and metrics in your analysis.",
-                "Provide clear buy/hold/sell recommendations with reasoning.",
-                "Compare stocks across multiple dimensions: price, fundamentals, analyst sentiment, and growth potential."
-            ],
-        )
+        assistant = _build_agent(openai_api_key, DEFAULT_MODEL)
     except Exception as e:
         st.error(f"Error initializing agent: {str(e)}")
         st.stop()
@@ -185,24 +418,7 @@ else:
 
     # Quick stats display
     if stock1 or stock2:
-        st.subheader("📊 Quick Stats")
-        quick_cols = st.columns(max(2, len([s for s in [stock1, stock2] if s])))
-        
-        for idx, stock in enumerate([stock1, stock2]):
-            if stock and validate_stock_symbol(stock):
-                try:
-                    ticker = yf.Ticker(stock)
-                    info = ticker.info
-                    current_price = info.get('currentPrice', info.get('regularMarketPrice', 'N/A'))
-                    
-                    with quick_cols[idx]:
-                        st.metric(
-                            label=f"{stock}",
-                            value=format_currency(current_price) if isinstance(current_price, (int, float)) else current_price,
-                            delta=f"{info.get('regularMarketChangePercent', 0):.2f}%" if 'regularMarketChangePercent' in info else None
-                        )
-                except Exception as e:
-                    st.error(f"Error fetching data for {stock}: {str(e)}")
+        quick_stats(stock1, stock2)
 
     # Perform analysis
     if analyze_button and stock1 and stock2:
@@ -232,23 +448,26 @@ else:
                         Format the response with clear sections, use tables for data, and provide actionable insights.
                         """
                         
-                        response: RunOutput = assistant.run(query, stream=False)
-                        
-                        # Display AI response
+                        # Stream the response so tokens appear as they arrive
                         st.markdown("### 🤖 AI Investment Analysis")
-                        st.markdown(response.content)
-                        
+                        placeholder = st.empty()
+                        response_text = ""
+                        for chunk in assistant.run(query, stream=True):
+                            if chunk.content:
+                                response_text += chunk.content
+                                placeholder.markdown(response_text)
+
                         # Save to history
                         analysis_entry = {
                             'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                             'stocks': f"{stock1} vs {stock2}",
                             'type': analysis_type,
-                            'response': response.content
+                            'response': response_text
                         }
                         st.session_state.analysis_history.append(analysis_entry)
                         
-                        # Persist to file
-                        save_analysis_history(st.session_state.analysis_history)
+                        # Persist to file (O(1) append, no full rewrite)
+                        append_analysis_entry(analysis_entry)
                         logger.info(f"Analysis saved: {stock1} vs {stock2}")
                         
                     except Exception as e:
@@ -259,73 +478,15 @@ else:
             with tab2:
                 st.subheader("📈 Price Comparison Charts")
                 try:
-                    # Fetch historical data
-                    ticker1 = yf.Ticker(stock1)
-                    ticker2 = yf.Ticker(stock2)
-                    
-                    hist1 = ticker1.history(period=time_period)
-                    hist2 = ticker2.history(period=time_period)
+                    fig = build_price_figure(stock1, stock2, time_period)
+                    fig_vol = build_volume_figure(stock1, stock2, time_period)
                     
-                    if not hist1.empty and not hist2.empty:
-                        # Price comparison chart
-                        fig = go.Figure()
-                        
-                        fig.add_trace(go.Scatter(
-                            x=hist1.index,
-                            y=hist1['Close'],
-                            mode='lines',
-                            name=stock1,
-                            line=dict(color='#1f77b4', width=2)
-                        ))
-                        
-                        fig.add_trace(go.Scatter(
-                            x=hist2.index,
-                            y=hist2['Close'],
-                            mode='lines',
-                            name=stock2,
-                            line=dict(color='#ff7f0e', width=2)
-                        ))
-                        
-                        fig.update_layout(
-                            title=f"Price Comparison: {stock1} vs {stock2}",
-                            xaxis_title="Date",
-                            yaxis_title="Price ($)",
-                            hovermode='x unified',
-                            height=500,
-                            template="plotly_white"
-                        )
-                        
+                    if fig is not None and fig_vol is not None:
                         st.plotly_chart(fig, use_container_width=True)
-                        
-                        # Volume comparison
-                        fig_vol = go.Figure()
-                        fig_vol.add_trace(go.Bar(
-                            x=hist1.index,
-                            y=hist1['Volume'],
-                            name=stock1,
-                            marker_color='#1f77b4',
-                            opacity=0.7
-                        ))
-                        fig_vol.add_trace(go.Bar(
-                            x=hist2.index,
-                            y=hist2['Volume'],
-                            name=stock2,
-                            marker_color='#ff7f0e',
-                            opacity=0.7
-                        ))
-                        
-                        fig_vol.update_layout(
-                            title="Trading Volume Comparison",
-                            xaxis_title="Date",
-                            yaxis_title="Volume",
-                            barmode='group',
-                            height=400,
-                            template="plotly_white"
-                        )
-                        
                         st.plotly_chart(fig_vol, use_container_width=True)
                         
                         # Performance metrics
+                        hist1, hist2 = get_history_pair(stock1, stock2, time_period)
                         col1, col2 = st.columns(2)
                         with col1:
                             st.metric(
@@ -347,52 +508,10 @@ else:
                 st.subheader("📊 Fundamental Analysis")
                 try:
                     with PerformanceTimer("fundamental_analysis"):
-                        ticker1 = yf.Ticker(stock1)
-                        ticker2 = yf.Ticker(stock2)
-                        
-                        info1 = ticker1.info
-                        info2 = ticker2.info
-                    
-                    # Create comparison table
-                    comparison_data = {
-                        'Metric': [
-                            'Current Price',
-                            'Market Cap',
-                            'P/E Ratio',
-                            'Forward P/E',
-                            'Dividend Yield',
-                            '52 Week High',
-                            '52 Week Low',
-                            'Beta',
-                            'Revenue Growth',
-                            'Profit Margin'
-                        ],
-                        stock1: [
-                            format_currency(info1.get('currentPrice', info1.get('regularMarketPrice', 'N/A'))),
-                            format_currency(info1.get('marketCap', 'N/A')),
-                            f"{info1.get('trailingPE', 'N/A')}",
-                            f"{info1.get('forwardPE', 'N/A')}",
-                            f"{info1.get('dividendYield', 0) * 100:.2f}%" if info1.get('dividendYield') else 'N/A',
-                            format_currency(info1.get('fiftyTwoWeekHigh', 'N/A')),
-                            format_currency(info1.get('fiftyTwoWeekLow', 'N/A')),
-                            f"{info1.get('beta', 'N/A')}",
-                            f"{info1.get('revenueGrowth', 'N/A')}",
-                            f"{info1.get('profitMargins', 0) * 100:.2f}%" if info1.get('profitMargins') else 'N/A'
-                        ],
-                        stock2: [
-                            format_currency(info2.get('currentPrice', info2.get('regularMarketPrice', 'N/A'))),
-                            format_currency(info2.get('marketCap', 'N/A')),
-                            f"{info2.get('trailingPE', 'N/A')}",
-                            f"{info2.get('forwardPE', 'N/A')}",
-                            f"{info2.get('dividendYield', 0) * 100:.2f}%" if info2.get('dividendYield') else 'N/A',
-                            format_currency(info2.get('fiftyTwoWeekHigh', 'N/A')),
-                            format_currency(info2.get('fiftyTwoWeekLow', 'N/A')),
-                            f"{info2.get('beta', 'N/A')}",
-                            f"{info2.get('revenueGrowth', 'N/A')}",
-                            f"{info2.get('profitMargins', 0) * 100:.2f}%" if info2.get('profitMargins') else 'N/A'
-                        ]
-                    }
+                        comparison_data = build_fundamentals_table(stock1, stock2)
                     
+                    import pandas as pd  # deferred: only needed to render the table
+
                     df_comparison = pd.DataFrame(comparison_data)
                     st.dataframe(df_comparison, use_container_width=True, hide_index=True)
                     
@@ -414,11 +533,7 @@ else:
             with tab4:
                 st.subheader("💡 Analyst Recommendations")
                 try:
-                    ticker1 = yf.Ticker(stock1)
-                    ticker2 = yf.Ticker(stock2)
-                    
-                    rec1 = ticker1.recommendations
-                    rec2 = ticker2.recommendations
+                    rec1, rec2 = fetch_pair(get_recommendations, stock1, stock2)
                     
                     col1, col2 = st.columns(2)
                     
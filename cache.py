@@ -4,13 +4,49 @@ Caching utilities for the Investment Agent application.
 
 import hashlib
 import json
+import os
 import pickle
-from datetime import datetime, timedelta
+import threading
+import time
 from pathlib import Path
 from typing import Any, Optional
 from config import CACHE_DURATION
+from exceptions import CacheError
 from logger import get_logger
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements
+    orjson = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+try:
+    import zstandard as zstd
+except ImportError:
+    zstd = None
+
+# Magic/version header: lets get() reject truncated or foreign files cheaply
+_MAGIC = b'IC01'
+
+# One-byte format markers following the magic header; lowercase means the
+# payload is zstd-compressed
+_FORMAT_JSON = b'J'
+_FORMAT_PICKLE = b'P'
+_FORMAT_JSON_ZSTD = b'j'
+_FORMAT_PICKLE_ZSTD = b'p'
+
+# Payloads below this size are stored uncompressed; compressing tiny
+# entries (validation booleans etc.) costs more than it saves
+_COMPRESS_THRESHOLD = 4096
+
+# Shared (de)compressors reuse their dictionaries across calls
+_zstd_compressor = zstd.ZstdCompressor(level=3) if zstd is not None else None
+_zstd_decompressor = zstd.ZstdDecompressor() if zstd is not None else None
+
 logger = get_logger("cache")
 
 # Create cache directory
@@ -30,71 +66,219 @@ class CacheManager:
         """
         self.duration = duration
         self.cache_dir = CACHE_DIR
+        # In-memory layer: key -> (expires_at, value), checked before disk
+        self._mem: dict = {}
+        self._mem_max_entries = 1024
+        # Guards _mem and _meta: get/set are called from worker threads
+        self._lock = threading.Lock()
+        # Incrementally maintained metadata (key_hash -> [expires_at, size]),
+        # persisted to meta.json so get_stats never has to scan the directory
+        self._meta_path = self.cache_dir / "meta.json"
+        self._meta = self._load_meta()
     
-    def _get_cache_key(self, key: str) -> str:
-        """Generate a cache key hash."""
-        return hashlib.md5(key.encode()).hexdigest()
+    def _get_cache_key(self, key: Any) -> str:
+        """Generate a cache key hash.
+
+        Accepts any hashable key; tuples and other non-strings go
+        through repr, which is deterministic for the literal keys used
+        here. Uses xxh3 when available, otherwise BLAKE2b — both
+        noticeably faster than MD5, which served no security purpose.
+        Either way the result is a 32-char hex digest.
+        """
+        if not isinstance(key, str):
+            key = repr(key)
+        if xxhash is not None:
+            return xxhash.xxh3_128_hexdigest(key.encode())
+        return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+    
+    def _get_cache_path(self, key: Any, expires_at: float) -> Path:
+        """Get the cache file path for a key, encoding the expiry epoch in the name."""
+        cache_key = self._get_cache_key(key)
+        return self.cache_dir / f"{cache_key}.{int(expires_at):x}.cache"
     
-    def _get_cache_path(self, key: str) -> Path:
-        """Get the cache file path for a key."""
+    def _find_cache_file(self, key: Any) -> Optional[Path]:
+        """Find the on-disk cache file for a key, if one exists."""
         cache_key = self._get_cache_key(key)
-        return self.cache_dir / f"{cache_key}.cache"
+        for path in self.cache_dir.glob(f"{cache_key}.*.cache"):
+            return path
+        return None
     
-    def get(self, key: str) -> Optional[Any]:
+    @staticmethod
+    def _expires_from_name(path: Path) -> float:
+        """Read the expiry epoch encoded in a cache filename."""
+        return float(int(path.name.split('.')[1], 16))
+    
+    @staticmethod
+    def _serialize(cache_data: dict) -> bytes:
+        """Serialize cache data, preferring orjson over pickle.
+        
+        yfinance info dicts and similar JSON-compatible payloads encode
+        several times faster with orjson; anything orjson cannot handle
+        (e.g. DataFrames) falls back to pickle.
+        """
+        if orjson is not None:
+            try:
+                payload = orjson.dumps(cache_data)
+                marker = _FORMAT_JSON
+            except TypeError:
+                payload = pickle.dumps(cache_data)
+                marker = _FORMAT_PICKLE
+        else:
+            payload = pickle.dumps(cache_data)
+            marker = _FORMAT_PICKLE
+        
+        if _zstd_compressor is not None and len(payload) >= _COMPRESS_THRESHOLD:
+            payload = _zstd_compressor.compress(payload)
+            marker = marker.lower()
+        
+        return _MAGIC + marker + payload
+    
+    @staticmethod
+    def _deserialize(raw: bytes) -> dict:
+        """Deserialize cache data written by _serialize."""
+        if raw[:4] != _MAGIC:
+            raise CacheError("Truncated or unrecognized cache file")
+        marker, payload = raw[4:5], raw[5:]
+        if marker in (_FORMAT_JSON_ZSTD, _FORMAT_PICKLE_ZSTD):
+            if _zstd_decompressor is None:
+                raise CacheError("zstandard is required to read this cache entry")
+            payload = _zstd_decompressor.decompress(payload)
+            marker = marker.upper()
+        if marker == _FORMAT_JSON:
+            if orjson is None:
+                raise CacheError("orjson is required to read this cache entry")
+            return orjson.loads(payload)
+        if marker == _FORMAT_PICKLE:
+            return pickle.loads(payload)
+        raise CacheError("Unrecognized cache file format")
+
+    def _load_meta(self) -> dict:
+        """Load the cache metadata index, falling back to a rebuild scan."""
+        if self._meta_path.exists():
+            try:
+                return json.loads(self._meta_path.read_text())
+            except Exception as e:
+                logger.error(f"Error reading cache metadata: {str(e)}")
+        return self._scan_meta()
+
+    def _scan_meta(self) -> dict:
+        """Build the metadata index from the files on disk."""
+        meta = {}
+        for path in self.cache_dir.glob("*.cache"):
+            try:
+                key_hash = path.name.split('.')[0]
+                meta[key_hash] = [self._expires_from_name(path), path.stat().st_size]
+            except (IndexError, ValueError, OSError):
+                continue
+        return meta
+
+    def _save_meta(self) -> None:
+        """Persist the metadata index atomically."""
+        try:
+            tmp_path = self._meta_path.with_suffix('.json.tmp')
+            tmp_path.write_text(json.dumps(self._meta))
+            os.replace(tmp_path, self._meta_path)
+        except Exception as e:
+            logger.error(f"Error writing cache metadata: {str(e)}")
+
+    def rebuild_stats(self) -> None:
+        """Reconcile the metadata index with the directory via a full scan."""
+        self._meta = self._scan_meta()
+        self._save_meta()
+
+    def _remember(self, key: Any, expires_at: float, value: Any) -> None:
+        """Store an entry in the in-memory layer, evicting the oldest on overflow."""
+        with self._lock:
+            if len(self._mem) >= self._mem_max_entries and key not in self._mem:
+                self._mem.pop(next(iter(self._mem)))
+            self._mem[key] = (expires_at, value)
+
+    def get(self, key: Any) -> Optional[Any]:
         """
         Retrieve a value from cache.
         
         Args:
-            key: Cache key
+            key: Cache key (string or any hashable, e.g. a tuple)
             
         Returns:
             Cached value or None if not found/expired
         """
-        cache_path = self._get_cache_path(key)
-        
-        if not cache_path.exists():
+        # In-memory layer first: repeated lookups skip disk I/O entirely
+        mem_entry = self._mem.get(key)
+        if mem_entry is not None:
+            expires_at, value = mem_entry
+            if time.time() <= expires_at:
+                logger.debug(f"Memory cache hit for key: {key}")
+                return value
+            self._mem.pop(key, None)
+
+        cache_path = self._find_cache_file(key)
+
+        if cache_path is None:
             return None
-        
+
         try:
-            with open(cache_path, 'rb') as f:
-                cache_data = pickle.load(f)
-            
-            # Check if cache is expired
-            if datetime.now() > cache_data['expires_at']:
+            # Expired entries are detected from the filename and never read
+            expires_at = self._expires_from_name(cache_path)
+            if time.time() > expires_at:
                 cache_path.unlink()  # Delete expired cache
+                with self._lock:
+                    if self._meta.pop(self._get_cache_key(key), None) is not None:
+                        self._save_meta()
                 logger.debug(f"Cache expired for key: {key}")
                 return None
             
+            with open(cache_path, 'rb') as f:
+                raw = f.read()
+            cache_data = self._deserialize(raw)
+            
             logger.debug(f"Cache hit for key: {key}")
+            self._remember(key, cache_data['expires_at'], cache_data['value'])
             return cache_data['value']
         
         except Exception as e:
             logger.error(f"Error reading cache for key {key}: {str(e)}")
             return None
     
-    def set(self, key: str, value: Any) -> bool:
+    def set(self, key: Any, value: Any, ttl: Optional[int] = None) -> bool:
         """
         Store a value in cache.
         
         Args:
-            key: Cache key
+            key: Cache key (string or any hashable, e.g. a tuple)
             value: Value to cache
+            ttl: Optional per-entry lifetime in seconds; defaults to the
+                manager's duration
             
         Returns:
             True if successful, False otherwise
         """
-        cache_path = self._get_cache_path(key)
-        
         try:
+            now = time.time()
             cache_data = {
                 'value': value,
-                'created_at': datetime.now(),
-                'expires_at': datetime.now() + timedelta(seconds=self.duration)
+                'created_at': now,
+                'expires_at': now + (ttl if ttl is not None else self.duration)
             }
             
-            with open(cache_path, 'wb') as f:
-                pickle.dump(cache_data, f)
+            # Drop any previous file for this key before writing the new one
+            old_path = self._find_cache_file(key)
+            if old_path is not None:
+                old_path.unlink()
             
+            # Write to a tempfile and rename so readers never see a partial file
+            cache_path = self._get_cache_path(key, cache_data['expires_at'])
+            tmp_path = cache_path.with_suffix('.tmp')
+            with open(tmp_path, 'wb') as f:
+                f.write(self._serialize(cache_data))
+            os.replace(tmp_path, cache_path)
+
+            with self._lock:
+                self._meta[self._get_cache_key(key)] = [
+                    cache_data['expires_at'], cache_path.stat().st_size
+                ]
+                self._save_meta()
+            self._remember(key, cache_data['expires_at'], value)
             logger.debug(f"Cached value for key: {key}")
             return True
         
@@ -102,7 +286,7 @@ class CacheManager:
             logger.error(f"Error writing cache for key {key}: {str(e)}")
             return False
     
-    def clear(self, key: Optional[str] = None) -> bool:
+    def clear(self, key: Optional[Any] = None) -> bool:
         """
         Clear cache entry or all cache.
         
@@ -114,14 +298,22 @@ class CacheManager:
         """
         try:
             if key:
-                cache_path = self._get_cache_path(key)
-                if cache_path.exists():
+                self._mem.pop(key, None)
+                cache_path = self._find_cache_file(key)
+                if cache_path is not None:
                     cache_path.unlink()
                     logger.debug(f"Cleared cache for key: {key}")
+                with self._lock:
+                    if self._meta.pop(self._get_cache_key(key), None) is not None:
+                        self._save_meta()
             else:
                 # Clear all cache files
                 for cache_file in self.cache_dir.glob("*.cache"):
                     cache_file.unlink()
+                with self._lock:
+                    self._mem.clear()
+                    self._meta = {}
+                    self._save_meta()
                 logger.debug("Cleared all cache")
             return True
         
@@ -136,27 +328,15 @@ class CacheManager:
         Returns:
             Dictionary with cache statistics
         """
-        cache_files = list(self.cache_dir.glob("*.cache"))
-        total_size = sum(f.stat().st_size for f in cache_files)
-        
-        active_count = 0
-        expired_count = 0
-        
-        for cache_file in cache_files:
-            try:
-                with open(cache_file, 'rb') as f:
-                    cache_data = pickle.load(f)
-                if datetime.now() <= cache_data['expires_at']:
-                    active_count += 1
-                else:
-                    expired_count += 1
-            except:
-                expired_count += 1
+        # Served from the incrementally maintained index: no directory scan
+        now = time.time()
+        active_count = sum(1 for expires, _ in self._meta.values() if now <= expires)
+        total_size = sum(size for _, size in self._meta.values())
         
         return {
-            'total_files': len(cache_files),
+            'total_files': len(self._meta),
             'active_entries': active_count,
-            'expired_entries': expired_count,
+            'expired_entries': len(self._meta) - active_count,
             'total_size_mb': round(total_size / (1024 * 1024), 2)
         }
 
@@ -23,6 +23,18 @@ MAX_RETRIES = 3  # Maximum number of retries for failed API calls
 CACHE_DURATION = 300  # Cache duration in seconds (5 minutes)
 HISTORICAL_DATA_PERIODS = ["1D", "5D", "1M", "3M", "6M", "1Y", "2Y", "5Y", "MAX"]
 
+# Agent Prompt Configuration
+# Kept as module-level constants so every agent build sends the exact same
+# system-prompt prefix; identical prefixes let the provider's prompt cache
+# hit on repeat calls.
+AGENT_DESCRIPTION = "You are an expert investment analyst that researches stock prices, analyst recommendations, and stock fundamentals. Provide detailed, actionable insights."
+AGENT_INSTRUCTIONS = (
+    "Format your response using markdown and use tables to display data where possible.",
+    "Include specific numbers, percentages, and metrics in your analysis.",
+    "Provide clear buy/hold/sell recommendations with reasoning.",
+    "Compare stocks across multiple dimensions: price, fundamentals, analyst sentiment, and growth potential.",
+)
+
 # Analysis Types
 ANALYSIS_TYPES = [
     "Quick Comparison",
@@ -35,6 +47,7 @@ ANALYSIS_TYPES = [
 
 # Display Configuration
 MAX_HISTORY_ITEMS = 10  # Maximum number of analysis history items to display
+SESSION_HISTORY_MAXLEN = 500  # Ring-buffer bound for in-session history entries
 CHART_HEIGHT = 500  # Default height for charts
 CHART_TEMPLATE = "plotly_white"  # Plotly chart template
 
@@ -43,5 +56,5 @@ ENABLE_CHARTS = True
 ENABLE_FUNDAMENTALS = True
 ENABLE_RECOMMENDATIONS = True
 ENABLE_HISTORY = True
-DEBUG_MODE = True
+DEBUG_MODE = False
 
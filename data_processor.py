@@ -7,9 +7,29 @@ import numpy as np
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 from logger import get_logger
+from _fast import HAVE_NUMBA, _drawdown_core, _trend_core
 
 logger = get_logger("data_processor")
 
+# Metrics shown in the side-by-side comparison table
+_COMPARISON_METRICS = (
+    ('Current Price', 'current_price'),
+    ('Market Cap', 'market_cap'),
+    ('P/E Ratio', 'pe_ratio'),
+    ('Dividend Yield', 'dividend_yield'),
+    ('Beta', 'beta'),
+    ('Volatility', 'volatility'),
+    ('RSI', 'rsi'),
+    ('Risk Score', 'risk_score')
+)
+
+# Memo for detect_support_resistance: Streamlit redraws call it with the
+# same frame repeatedly. The key mixes in the last Close value because
+# id() alone is unsafe — a recycled address plus a matching length and
+# last index could otherwise revive another symbol's entry.
+_support_resistance_cache: Dict = {}
+_SUPPORT_RESISTANCE_CACHE_MAX = 128
+
 
 def calculate_moving_averages(hist_data: pd.DataFrame, periods: List[int] = [20, 50, 200]) -> pd.DataFrame:
     """
@@ -26,11 +46,19 @@ def calculate_moving_averages(hist_data: pd.DataFrame, periods: List[int] = [20,
         return hist_data
     
     try:
-        result = hist_data.copy()
+        close = hist_data['Close'].to_numpy(dtype=np.float64)
+        # One cumulative-sum pass over Close serves every window size:
+        # each MA is a difference of prefix sums instead of its own
+        # rolling pass
+        cumsum = np.concatenate(([0.0], np.cumsum(close)))
+        ma_columns = {}
         for period in periods:
-            if len(result) >= period:
-                result[f'MA_{period}'] = result['Close'].rolling(window=period).mean()
-        return result
+            if len(close) >= period:
+                ma = (cumsum[period:] - cumsum[:-period]) / period
+                ma_columns[f'MA_{period}'] = np.concatenate([np.full(period - 1, np.nan), ma])
+        # assign() shares the existing column blocks; only the new MA
+        # columns are allocated, instead of deep-copying the whole frame
+        return hist_data.assign(**ma_columns)
     except Exception as e:
         logger.error(f"Error calculating moving averages: {str(e)}")
         return hist_data
@@ -51,14 +79,24 @@ def detect_support_resistance(hist_data: pd.DataFrame, window: int = 20) -> Dict
         return {'support': None, 'resistance': None}
     
     try:
+        cache_key = (id(hist_data), len(hist_data), hist_data.index[-1],
+                     float(hist_data['Close'].iloc[-1]), window)
+        cached = _support_resistance_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         recent_data = hist_data.tail(window)
         support = recent_data['Low'].min()
         resistance = recent_data['High'].max()
-        
-        return {
+
+        result = {
             'support': float(support),
             'resistance': float(resistance)
         }
+        if len(_support_resistance_cache) >= _SUPPORT_RESISTANCE_CACHE_MAX:
+            _support_resistance_cache.pop(next(iter(_support_resistance_cache)))
+        _support_resistance_cache[cache_key] = result
+        return result
     except Exception as e:
         logger.error(f"Error detecting support/resistance: {str(e)}")
         return {'support': None, 'resistance': None}
@@ -90,6 +128,36 @@ def calculate_price_targets(current_price: float, support: float, resistance: fl
         return {}
 
 
+def calculate_price_targets_batch(current: np.ndarray, support: np.ndarray,
+                                  resistance: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Calculate price targets for many stocks in one vectorized pass.
+
+    Args:
+        current: Array of current prices
+        support: Array of support levels
+        resistance: Array of resistance levels
+
+    Returns:
+        Dictionary mapping target names to arrays, one entry per stock
+    """
+    try:
+        current = np.asarray(current, dtype=np.float64)
+        support = np.asarray(support, dtype=np.float64)
+        resistance = np.asarray(resistance, dtype=np.float64)
+
+        range_size = resistance - support
+        return {
+            'conservative_target': current + range_size * 0.1,
+            'moderate_target': current + range_size * 0.25,
+            'aggressive_target': current + range_size * 0.5,
+            'stop_loss': support * 0.95
+        }
+    except Exception as e:
+        logger.error(f"Error calculating batch price targets: {str(e)}")
+        return {}
+
+
 def analyze_trend(hist_data: pd.DataFrame) -> Dict[str, any]:
     """
     Analyze price trend.
@@ -107,27 +175,34 @@ def analyze_trend(hist_data: pd.DataFrame) -> Dict[str, any]:
         # Calculate short-term and long-term trends
         short_period = min(20, len(hist_data) // 2)
         long_period = min(50, len(hist_data))
+        close = hist_data['Close'].to_numpy(dtype=np.float64)
         
-        short_ma = hist_data['Close'].tail(short_period).mean()
-        long_ma = hist_data['Close'].tail(long_period).mean()
-        current_price = hist_data['Close'].iloc[-1]
-        
-        # Determine trend
-        if current_price > short_ma > long_ma:
-            trend = 'bullish'
-            strength = min(100, ((current_price - long_ma) / long_ma) * 1000)
-        elif current_price < short_ma < long_ma:
-            trend = 'bearish'
-            strength = min(100, ((long_ma - current_price) / long_ma) * 1000)
+        if HAVE_NUMBA:
+            trend_code, strength, short_ma, long_ma = _trend_core(
+                close, short_period, long_period
+            )
+            trend = {1: 'bullish', -1: 'bearish', 0: 'sideways'}[trend_code]
         else:
-            trend = 'sideways'
-            strength = 50
+            # ndarray slices are views, so the tail means allocate nothing
+            short_ma = float(close[-short_period:].mean())
+            long_ma = float(close[-long_period:].mean())
+            current_price = float(close[-1])
+            
+            if current_price > short_ma > long_ma:
+                trend = 'bullish'
+                strength = min(100, ((current_price - long_ma) / long_ma) * 1000)
+            elif current_price < short_ma < long_ma:
+                trend = 'bearish'
+                strength = min(100, ((long_ma - current_price) / long_ma) * 1000)
+            else:
+                trend = 'sideways'
+                strength = 50
         
         return {
             'trend': trend,
-            'strength': round(strength, 2),
-            'short_ma': round(short_ma, 2),
-            'long_ma': round(long_ma, 2)
+            'strength': round(float(strength), 2),
+            'short_ma': round(float(short_ma), 2),
+            'long_ma': round(float(long_ma), 2)
         }
     except Exception as e:
         logger.error(f"Error analyzing trend: {str(e)}")
@@ -146,22 +221,25 @@ def calculate_correlation(hist_data1: pd.DataFrame, hist_data2: pd.DataFrame) ->
         Correlation coefficient (-1 to 1)
     """
     try:
-        # Align dates
-        common_dates = hist_data1.index.intersection(hist_data2.index)
-        
-        if len(common_dates) < 2:
+        # One inner-join concat aligns the dates; everything after is numpy
+        joined = pd.concat(
+            [hist_data1['Close'].rename('a'), hist_data2['Close'].rename('b')],
+            axis=1, join='inner'
+        ).to_numpy(dtype=np.float64)
+
+        if joined.shape[0] < 3:
             return 0.0
-        
-        returns1 = hist_data1.loc[common_dates, 'Close'].pct_change().dropna()
-        returns2 = hist_data2.loc[common_dates, 'Close'].pct_change().dropna()
-        
-        # Align returns
-        common_returns = pd.concat([returns1, returns2], axis=1).dropna()
-        
-        if len(common_returns) < 2:
+
+        a = joined[:, 0]
+        b = joined[:, 1]
+        returns1 = np.diff(a) / a[:-1]
+        returns2 = np.diff(b) / b[:-1]
+
+        mask = np.isfinite(returns1) & np.isfinite(returns2)
+        if int(np.count_nonzero(mask)) < 2:
             return 0.0
-        
-        correlation = common_returns.iloc[:, 0].corr(common_returns.iloc[:, 1])
+
+        correlation = float(np.corrcoef(returns1[mask], returns2[mask])[0, 1])
         return round(correlation, 4) if not np.isnan(correlation) else 0.0
     except Exception as e:
         logger.error(f"Error calculating correlation: {str(e)}")
@@ -182,18 +260,20 @@ def calculate_drawdown(hist_data: pd.DataFrame) -> Dict[str, float]:
         return {'max_drawdown': 0, 'current_drawdown': 0}
     
     try:
-        # Calculate running maximum
-        running_max = hist_data['Close'].expanding().max()
-        
-        # Calculate drawdown
-        drawdown = (hist_data['Close'] - running_max) / running_max * 100
-        
-        max_drawdown = drawdown.min()
-        current_drawdown = drawdown.iloc[-1]
-        
+        close = hist_data['Close'].to_numpy(dtype=np.float64)
+
+        if HAVE_NUMBA:
+            # Single fused pass: running max, drawdown and min in one loop
+            max_drawdown, current_drawdown = _drawdown_core(close)
+        else:
+            running_max = np.maximum.accumulate(close)
+            drawdown = (close - running_max) / running_max * 100
+            max_drawdown = float(drawdown.min())
+            current_drawdown = float(drawdown[-1])
+
         return {
-            'max_drawdown': round(max_drawdown, 2),
-            'current_drawdown': round(current_drawdown, 2)
+            'max_drawdown': round(float(max_drawdown), 2),
+            'current_drawdown': round(float(current_drawdown), 2)
         }
     except Exception as e:
         logger.error(f"Error calculating drawdown: {str(e)}")
@@ -212,34 +292,18 @@ def prepare_comparison_data(stock1_data: Dict, stock2_data: Dict) -> pd.DataFram
         DataFrame ready for display
     """
     try:
-        comparison = {
-            'Metric': [],
-            stock1_data.get('symbol', 'Stock 1'): [],
-            stock2_data.get('symbol', 'Stock 2'): []
-        }
-        
-        # Common metrics to compare
-        metrics = [
-            ('Current Price', 'current_price'),
-            ('Market Cap', 'market_cap'),
-            ('P/E Ratio', 'pe_ratio'),
-            ('Dividend Yield', 'dividend_yield'),
-            ('Beta', 'beta'),
-            ('Volatility', 'volatility'),
-            ('RSI', 'rsi'),
-            ('Risk Score', 'risk_score')
+        # Single DataFrame allocation from row tuples; no per-metric
+        # dict-key lookups or list appends
+        rows = [
+            (name, stock1_data.get(key, 'N/A'), stock2_data.get(key, 'N/A'))
+            for name, key in _COMPARISON_METRICS
         ]
-        
-        for metric_name, metric_key in metrics:
-            comparison['Metric'].append(metric_name)
-            comparison[stock1_data.get('symbol', 'Stock 1')].append(
-                stock1_data.get(metric_key, 'N/A')
-            )
-            comparison[stock2_data.get('symbol', 'Stock 2')].append(
-                stock2_data.get(metric_key, 'N/A')
-            )
-        
-        return pd.DataFrame(comparison)
+        columns = [
+            'Metric',
+            stock1_data.get('symbol', 'Stock 1'),
+            stock2_data.get('symbol', 'Stock 2')
+        ]
+        return pd.DataFrame(rows, columns=columns)
     except Exception as e:
         logger.error(f"Error preparing comparison data: {str(e)}")
         return pd.DataFrame()
@@ -259,32 +323,31 @@ def aggregate_portfolio_metrics(stocks_data: List[Dict]) -> Dict[str, any]:
         return {}
     
     try:
-        total_market_cap = 0
-        total_pe = 0
-        total_beta = 0
-        total_risk = 0
-        valid_count = 0
-        
-        for stock_data in stocks_data:
-            # Extract numeric values (handle formatted strings)
-            market_cap = stock_data.get('market_cap', 0)
-            pe = stock_data.get('pe_ratio', 0)
-            beta = stock_data.get('beta', 1.0)
-            risk = stock_data.get('risk_score', 5.0)
-            
-            if isinstance(market_cap, (int, float)):
-                total_market_cap += market_cap
-            if isinstance(pe, (int, float)) and pe > 0:
-                total_pe += pe
-                valid_count += 1
-            if isinstance(beta, (int, float)):
-                total_beta += beta
-            if isinstance(risk, (int, float)):
-                total_risk += risk
-        
-        avg_pe = total_pe / valid_count if valid_count > 0 else 0
-        avg_beta = total_beta / len(stocks_data) if stocks_data else 0
-        avg_risk = total_risk / len(stocks_data) if stocks_data else 0
+        count = len(stocks_data)
+
+        def _column(key, default):
+            # Extract one numeric field across all stocks; non-numeric
+            # values (formatted strings etc.) become NaN
+            return np.fromiter(
+                (stock.get(key, default)
+                 if isinstance(stock.get(key, default), (int, float)) else np.nan
+                 for stock in stocks_data),
+                dtype=np.float64,
+                count=count
+            )
+
+        market_cap = _column('market_cap', 0)
+        pe = _column('pe_ratio', 0)
+        beta = _column('beta', 1.0)
+        risk = _column('risk_score', 5.0)
+
+        total_market_cap = float(np.nansum(market_cap))
+        pe_mask = pe > 0  # NaN compares False, so invalid entries drop out
+        valid_count = int(np.count_nonzero(pe_mask))
+
+        avg_pe = float(pe[pe_mask].mean()) if valid_count > 0 else 0
+        avg_beta = float(np.nansum(beta)) / count
+        avg_risk = float(np.nansum(risk)) / count
         
         return {
             'total_stocks': len(stocks_data),
@@ -2,11 +2,33 @@
 Error handling utilities for better user experience.
 """
 
+import re
 import traceback
 from typing import Optional, Callable
-from functools import wraps
+from functools import lru_cache, wraps
 from logger import logger, log_error
 
+# One alternation regex scans the message once instead of three
+# sequential substring tests over a lowered copy
+_ERROR_PATTERN_RE = re.compile(r'(api key|symbol|ticker|rate limit)', re.IGNORECASE)
+
+_PATTERN_MESSAGES = {
+    'api key': "Invalid or missing API key. Please check your OpenAI API key in the sidebar.",
+    'symbol': "Invalid stock symbol. Please enter a valid ticker symbol (e.g., AAPL, MSFT).",
+    'ticker': "Invalid stock symbol. Please enter a valid ticker symbol (e.g., AAPL, MSFT).",
+    'rate limit': "API rate limit exceeded. Please wait a moment and try again.",
+}
+
+# Map common errors to user-friendly messages (hoisted so it is built once)
+_ERROR_MAPPINGS = {
+    'StockDataError': "Unable to retrieve stock data. Please check the stock symbol and try again.",
+    'APIError': "API request failed. Please check your API key and internet connection.",
+    'ValidationError': "Invalid input. Please check your data and try again.",
+    'KeyError': "Missing required data. Please try again.",
+    'TimeoutError': "Request timed out. Please try again later.",
+    'ConnectionError': "Connection error. Please check your internet connection.",
+}
+
 
 class InvestmentAgentError(Exception):
     """Base exception for Investment Agent errors."""
@@ -36,21 +58,20 @@ def handle_errors(context: str = ""):
         context: Context description for error logging
     """
     def decorator(func: Callable):
+        # Resolved once at decoration time, not per call
+        _ctx = context or func.__name__
+
         @wraps(func)
         def wrapper(*args, **kwargs):
             try:
                 return func(*args, **kwargs)
-            except StockDataError as e:
-                logger.error(f"Stock data error in {context or func.__name__}: {e}")
-                raise
-            except APIError as e:
-                logger.error(f"API error in {context or func.__name__}: {e}")
-                raise
-            except ValidationError as e:
-                logger.error(f"Validation error in {context or func.__name__}: {e}")
+            except InvestmentAgentError as e:
+                # One branch covers StockDataError, APIError and
+                # ValidationError; the type name keeps the log specific
+                logger.error(f"{type(e).__name__} in {_ctx}: {e}")
                 raise
             except Exception as e:
-                log_error(e, context or func.__name__)
+                log_error(e, _ctx)
                 raise InvestmentAgentError(f"Unexpected error: {str(e)}")
         return wrapper
     return decorator
@@ -66,31 +87,23 @@ def get_user_friendly_error_message(error: Exception) -> str:
     Returns:
         User-friendly error message
     """
-    error_type = type(error).__name__
-    error_message = str(error)
-    
-    # Map common errors to user-friendly messages
-    error_mappings = {
-        'StockDataError': "Unable to retrieve stock data. Please check the stock symbol and try again.",
-        'APIError': "API request failed. Please check your API key and internet connection.",
-        'ValidationError': "Invalid input. Please check your data and try again.",
-        'KeyError': "Missing required data. Please try again.",
-        'TimeoutError': "Request timed out. Please try again later.",
-        'ConnectionError': "Connection error. Please check your internet connection.",
-    }
-    
-    # Check for specific error patterns
-    if "API key" in error_message.lower():
-        return "Invalid or missing API key. Please check your OpenAI API key in the sidebar."
-    
-    if "symbol" in error_message.lower() or "ticker" in error_message.lower():
-        return "Invalid stock symbol. Please enter a valid ticker symbol (e.g., AAPL, MSFT)."
-    
-    if "rate limit" in error_message.lower():
-        return "API rate limit exceeded. Please wait a moment and try again."
-    
+    return _classify(type(error).__name__, str(error))
+
+
+@lru_cache(maxsize=256)
+def _classify(error_type: str, error_message: str) -> str:
+    """Classify an error into a user-friendly message.
+
+    Memoized: the same errors recur on the hot path, and classification is
+    a pure function of the error type and message.
+    """
+    # Check for specific error patterns in one linear scan
+    match = _ERROR_PATTERN_RE.search(error_message)
+    if match:
+        return _PATTERN_MESSAGES[match.group(1).lower()]
+
     # Return mapped message or generic one
-    return error_mappings.get(error_type, f"An error occurred: {error_message}")
+    return _ERROR_MAPPINGS.get(error_type, f"An error occurred: {error_message}")
 
 
 def safe_execute(func: Callable, default_return=None, error_message: Optional[str] = None):
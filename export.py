@@ -4,12 +4,20 @@ Export functionality for analysis results.
 
 import json
 import csv
+import os
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 import pandas as pd
 from logger import get_logger
 
+try:
+    import pyarrow
+    import pyarrow.csv
+    HAVE_PYARROW = True
+except ImportError:
+    HAVE_PYARROW = False
+
 logger = get_logger("export")
 
 # Create exports directory
@@ -24,13 +32,40 @@ class ExportManager:
         """Initialize export manager."""
         self.export_dir = EXPORT_DIR
     
-    def export_json(self, data: Dict[str, Any], filename: str = None) -> Path:
+    def _write_frame(self, df: pd.DataFrame, filename: str, format: str) -> Path:
+        """Write a DataFrame in the requested format.
+        
+        Parquet and feather need pyarrow; without it the export degrades
+        to CSV. CSV itself goes through Arrow's SIMD writer when pyarrow
+        is installed.
+        """
+        if format in ('parquet', 'feather') and not HAVE_PYARROW:
+            logger.warning(f"pyarrow not installed; exporting {filename} as csv instead of {format}")
+            format = 'csv'
+        
+        if format == 'parquet':
+            filepath = self.export_dir / f"{filename}.parquet"
+            df.to_parquet(filepath, engine='pyarrow', compression='snappy')
+        elif format == 'feather':
+            filepath = self.export_dir / f"{filename}.feather"
+            df.to_feather(filepath)
+        else:
+            filepath = self.export_dir / f"{filename}.csv"
+            if HAVE_PYARROW:
+                pyarrow.csv.write_csv(pyarrow.Table.from_pandas(df, preserve_index=False), filepath)
+            else:
+                df.to_csv(filepath, index=False, encoding='utf-8')
+        return filepath
+    
+    def export_json(self, data: Dict[str, Any], filename: str = None,
+                    pretty: bool = False) -> Path:
         """
         Export data to JSON file.
         
         Args:
             data: Data to export
             filename: Optional filename (without extension)
+            pretty: Indent the output for human readers (slower, larger)
             
         Returns:
             Path to exported file
@@ -41,8 +76,13 @@ class ExportManager:
         filepath = self.export_dir / f"{filename}.json"
         
         try:
+            # Compact output by default: exports are machine-read, and
+            # skipping the pretty-printer cuts encoder work and bytes
             with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, default=str)
+                if pretty:
+                    json.dump(data, f, indent=2, default=str)
+                else:
+                    json.dump(data, f, separators=(',', ':'), default=str)
             
             logger.info(f"Exported JSON to {filepath}")
             return filepath
@@ -51,13 +91,15 @@ class ExportManager:
             logger.error(f"Error exporting JSON: {str(e)}")
             raise
     
-    def export_csv(self, data: List[Dict[str, Any]], filename: str = None) -> Path:
+    def export_csv(self, data: List[Dict[str, Any]], filename: str = None,
+                   format: str = 'csv') -> Path:
         """
-        Export data to CSV file.
+        Export data to a tabular file.
         
         Args:
             data: List of dictionaries to export
             filename: Optional filename (without extension)
+            format: Output format: 'csv', 'parquet' or 'feather'
             
         Returns:
             Path to exported file
@@ -65,29 +107,28 @@ class ExportManager:
         if filename is None:
             filename = f"analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         
-        filepath = self.export_dir / f"{filename}.csv"
-        
         try:
             if not data:
                 raise ValueError("No data to export")
             
-            df = pd.DataFrame(data)
-            df.to_csv(filepath, index=False, encoding='utf-8')
+            filepath = self._write_frame(pd.DataFrame(data), filename, format)
             
-            logger.info(f"Exported CSV to {filepath}")
+            logger.info(f"Exported {format.upper()} to {filepath}")
             return filepath
         
         except Exception as e:
-            logger.error(f"Error exporting CSV: {str(e)}")
+            logger.error(f"Error exporting {format.upper()}: {str(e)}")
             raise
     
-    def export_comparison_table(self, comparison_data: Dict[str, List], filename: str = None) -> Path:
+    def export_comparison_table(self, comparison_data: Dict[str, List], filename: str = None,
+                                format: str = 'csv') -> Path:
         """
-        Export comparison table to CSV.
+        Export comparison table to a tabular file.
         
         Args:
             comparison_data: Dictionary with 'Metric' key and stock symbols as keys
             filename: Optional filename (without extension)
+            format: Output format: 'csv', 'parquet' or 'feather'
             
         Returns:
             Path to exported file
@@ -95,11 +136,8 @@ class ExportManager:
         if filename is None:
             filename = f"comparison_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         
-        filepath = self.export_dir / f"{filename}.csv"
-        
         try:
-            df = pd.DataFrame(comparison_data)
-            df.to_csv(filepath, index=False, encoding='utf-8')
+            filepath = self._write_frame(pd.DataFrame(comparison_data), filename, format)
             
             logger.info(f"Exported comparison table to {filepath}")
             return filepath
@@ -141,21 +179,30 @@ class ExportManager:
         Returns:
             List of export file information
         """
-        exports = []
-        
-        for filepath in sorted(self.export_dir.glob("*.*"), key=lambda p: p.stat().st_mtime, reverse=True):
-            try:
-                stat = filepath.stat()
-                exports.append({
-                    'filename': filepath.name,
-                    'path': str(filepath),
-                    'size_mb': round(stat.st_size / (1024 * 1024), 2),
-                    'created_at': datetime.fromtimestamp(stat.st_mtime).isoformat()
-                })
-            except Exception as e:
-                logger.error(f"Error reading export file {filepath}: {str(e)}")
-        
-        return exports
+        entries = []
+        
+        try:
+            # scandir reuses the stat data from the directory read: one
+            # syscall per file instead of glob + a separate stat() each
+            with os.scandir(self.export_dir) as it:
+                for entry in it:
+                    if entry.is_file() and '.' in entry.name:
+                        entries.append((entry.name, entry.path, entry.stat()))
+        except Exception as e:
+            logger.error(f"Error scanning export directory: {str(e)}")
+            return []
+        
+        entries.sort(key=lambda e: e[2].st_mtime, reverse=True)
+        
+        return [
+            {
+                'filename': name,
+                'path': path,
+                'size_mb': round(stat.st_size / (1024 * 1024), 2),
+                'created_at': datetime.fromtimestamp(stat.st_mtime).isoformat()
+            }
+            for name, path, stat in entries
+        ]
 
 
 # Global export manager instance
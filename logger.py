@@ -8,34 +8,69 @@ from datetime import datetime
 from pathlib import Path
 from config import DEBUG_MODE
 
-# Create logs directory if it doesn't exist
 LOG_DIR = Path("logs")
-LOG_DIR.mkdir(exist_ok=True)
 
 # Configure logging format
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 
+_configured = False
+
+
+def _configure():
+    """Attach console and file handlers, once.
+
+    Deferred to the first actual log emission so that modules which merely
+    import a logger don't pay for the logs/ mkdir, the datetime formatting
+    and the FileHandler open at import time.
+    """
+    global _configured
+    if _configured:
+        return
+    _configured = True
+
+    root_logger = logging.getLogger("investment_agent")
+    root_logger.setLevel(logging.DEBUG if DEBUG_MODE else logging.INFO)
+
+    # Prevent duplicate handlers
+    if not root_logger.handlers:
+        # Console handler
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setLevel(logging.INFO)
+        console_formatter = logging.Formatter(LOG_FORMAT, DATE_FORMAT)
+        console_handler.setFormatter(console_formatter)
+        root_logger.addHandler(console_handler)
+
+        # File handler
+        LOG_DIR.mkdir(exist_ok=True)
+        log_file = LOG_DIR / f"investment_agent_{datetime.now().strftime('%Y%m%d')}.log"
+        file_handler = logging.FileHandler(log_file)
+        file_handler.setLevel(logging.DEBUG)
+        file_formatter = logging.Formatter(LOG_FORMAT, DATE_FORMAT)
+        file_handler.setFormatter(file_formatter)
+        root_logger.addHandler(file_handler)
+
+
+class _LazyLogger:
+    """Proxy that configures handlers on first use, then gets out of the way.
+
+    Attribute lookups trigger _configure() and are cached on the instance,
+    so after the first call every logger.info(...) goes straight to the
+    real bound method.
+    """
+
+    def __init__(self, name: str = "investment_agent"):
+        self._name = name
+
+    def __getattr__(self, attr):
+        _configure()
+        value = getattr(logging.getLogger(self._name), attr)
+        setattr(self, attr, value)
+        return value
+
+
 # Create logger
-logger = logging.getLogger("investment_agent")
-logger.setLevel(logging.DEBUG if DEBUG_MODE else logging.INFO)
-
-# Prevent duplicate handlers
-if not logger.handlers:
-    # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(logging.INFO)
-    console_formatter = logging.Formatter(LOG_FORMAT, DATE_FORMAT)
-    console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
-    
-    # File handler
-    log_file = LOG_DIR / f"investment_agent_{datetime.now().strftime('%Y%m%d')}.log"
-    file_handler = logging.FileHandler(log_file)
-    file_handler.setLevel(logging.DEBUG)
-    file_formatter = logging.Formatter(LOG_FORMAT, DATE_FORMAT)
-    file_handler.setFormatter(file_formatter)
-    logger.addHandler(file_handler)
+logger = _LazyLogger()
 
 
 def log_function_call(func_name: str, **kwargs):
@@ -56,7 +91,7 @@ def log_performance(operation: str, duration: float):
 
 
 def get_logger(name: str = None):
-    """Get a logger instance."""
+    """Get a logger instance (handlers are attached lazily on first use)."""
     if name:
-        return logging.getLogger(f"investment_agent.{name}")
+        return _LazyLogger(f"investment_agent.{name}")
     return logger
@@ -3,13 +3,41 @@ Performance monitoring utilities.
 """
 
 import time
+from collections import defaultdict, deque
 from functools import wraps
-from typing import Callable, Dict, List
+from typing import Callable, Deque, Dict
 from datetime import datetime
 from logger import logger, log_performance
 
-# Performance metrics storage
-_performance_metrics: List[Dict[str, any]] = []
+
+def _new_aggregate() -> Dict[str, float]:
+    return {'count': 0, 'total': 0.0, 'min': float('inf'), 'max': float('-inf')}
+
+
+# Recent raw samples, bounded so long sessions don't leak memory
+_performance_metrics: Deque[Dict[str, any]] = deque(maxlen=10000)
+
+# Running per-function aggregates, updated on every call so stats reads
+# never rescan the sample buffer
+_function_aggregates: Dict[str, Dict[str, float]] = defaultdict(_new_aggregate)
+
+
+def _record_metric(func_name: str, duration: float, args_count: int = 0, kwargs_count: int = 0):
+    """Store one timing sample and fold it into the running aggregates."""
+    _performance_metrics.append({
+        'function': func_name,
+        'duration': duration,
+        'timestamp': datetime.now().isoformat(),
+        'args_count': args_count,
+        'kwargs_count': kwargs_count
+    })
+    agg = _function_aggregates[func_name]
+    agg['count'] += 1
+    agg['total'] += duration
+    if duration < agg['min']:
+        agg['min'] = duration
+    if duration > agg['max']:
+        agg['max'] = duration
 
 
 def measure_time(func: Callable):
@@ -24,22 +52,15 @@ def measure_time(func: Callable):
     """
     @wraps(func)
     def wrapper(*args, **kwargs):
-        start_time = time.time()
+        # Monotonic vDSO-backed counter: ns resolution, no wall-clock drift
+        start_time = time.perf_counter_ns()
         try:
             result = func(*args, **kwargs)
             return result
         finally:
-            duration = time.time() - start_time
+            duration = (time.perf_counter_ns() - start_time) * 1e-9
             log_performance(func.__name__, duration)
-            
-            # Store metric
-            _performance_metrics.append({
-                'function': func.__name__,
-                'duration': duration,
-                'timestamp': datetime.now().isoformat(),
-                'args_count': len(args),
-                'kwargs_count': len(kwargs)
-            })
+            _record_metric(func.__name__, duration, len(args), len(kwargs))
     return wrapper
 
 
@@ -50,7 +71,7 @@ def get_performance_stats() -> Dict[str, any]:
     Returns:
         Dictionary with performance statistics
     """
-    if not _performance_metrics:
+    if not _function_aggregates:
         return {
             'total_calls': 0,
             'average_duration': 0,
@@ -59,43 +80,41 @@ def get_performance_stats() -> Dict[str, any]:
             'functions': {}
         }
     
-    durations = [m['duration'] for m in _performance_metrics]
+    # Read the running aggregates: O(#functions), not O(#calls)
     function_stats = {}
+    total_calls = 0
+    total_duration = 0.0
+    min_duration = float('inf')
+    max_duration = float('-inf')
     
-    for metric in _performance_metrics:
-        func_name = metric['function']
-        if func_name not in function_stats:
-            function_stats[func_name] = {
-                'count': 0,
-                'total_duration': 0,
-                'durations': []
-            }
-        
-        function_stats[func_name]['count'] += 1
-        function_stats[func_name]['total_duration'] += metric['duration']
-        function_stats[func_name]['durations'].append(metric['duration'])
-    
-    # Calculate averages
-    for func_name in function_stats:
-        stats = function_stats[func_name]
-        stats['average_duration'] = stats['total_duration'] / stats['count']
-        stats['min_duration'] = min(stats['durations'])
-        stats['max_duration'] = max(stats['durations'])
-        del stats['durations']  # Remove raw durations
+    for func_name, agg in _function_aggregates.items():
+        function_stats[func_name] = {
+            'count': agg['count'],
+            'total_duration': agg['total'],
+            'average_duration': agg['total'] / agg['count'],
+            'min_duration': agg['min'],
+            'max_duration': agg['max']
+        }
+        total_calls += agg['count']
+        total_duration += agg['total']
+        if agg['min'] < min_duration:
+            min_duration = agg['min']
+        if agg['max'] > max_duration:
+            max_duration = agg['max']
     
     return {
-        'total_calls': len(_performance_metrics),
-        'average_duration': sum(durations) / len(durations),
-        'min_duration': min(durations),
-        'max_duration': max(durations),
+        'total_calls': total_calls,
+        'average_duration': total_duration / total_calls,
+        'min_duration': min_duration,
+        'max_duration': max_duration,
         'functions': function_stats
     }
 
 
 def reset_performance_metrics():
     """Reset all performance metrics."""
-    global _performance_metrics
-    _performance_metrics = []
+    _performance_metrics.clear()
+    _function_aggregates.clear()
     logger.info("Performance metrics reset")
 
 
@@ -108,10 +127,10 @@ class PerformanceTimer:
         self.duration = None
     
     def __enter__(self):
-        self.start_time = time.time()
+        self.start_time = time.perf_counter_ns()
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.duration = time.time() - self.start_time
+        self.duration = (time.perf_counter_ns() - self.start_time) * 1e-9
         log_performance(self.operation_name, self.duration)
         return False
@@ -9,16 +9,147 @@ from datetime import datetime
 from typing import List, Dict, Any, Optional
 from logger import logger
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements
+    orjson = None
+
 DATA_DIR = Path("data")
 DATA_DIR.mkdir(exist_ok=True)
 
-HISTORY_FILE = DATA_DIR / "analysis_history.json"
+HISTORY_FILE = DATA_DIR / "analysis_history.jsonl"
+LEGACY_HISTORY_FILE = DATA_DIR / "analysis_history.json"
 SETTINGS_FILE = DATA_DIR / "user_settings.json"
 
+# (mtime_ns, size) -> parsed result caches; Streamlit reruns hit these
+# instead of re-reading and re-parsing the history file per interaction
+_history_cache: Optional[tuple] = None
+_stats_cache: Optional[tuple] = None
+
+
+def _history_signature() -> Optional[tuple]:
+    """Stat signature of the history file, or None if it doesn't exist."""
+    try:
+        stat = HISTORY_FILE.stat()
+        return (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        return None
+
+
+def _invalidate_history_caches() -> None:
+    global _history_cache, _stats_cache
+    _history_cache = None
+    _stats_cache = None
+
+
+def _write_json(path: Path, obj: Dict[str, Any], pretty: bool = False) -> None:
+    """Write a dict as JSON, compact by default, via orjson when available."""
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if pretty else 0
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj, option=option, default=str))
+    elif pretty:
+        with open(path, 'w') as f:
+            json.dump(obj, f, indent=2, default=str)
+    else:
+        with open(path, 'w') as f:
+            json.dump(obj, f, separators=(',', ':'), default=str)
+
+
+def _read_json(path: Path) -> Dict[str, Any]:
+    """Read a JSON file, using orjson's C decoder when available."""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def _dumps_line(entry: Dict[str, Any]) -> bytes:
+    """Encode one history entry as a JSONL line."""
+    if orjson is not None:
+        return orjson.dumps(entry, default=str) + b'\n'
+    return json.dumps(entry, default=str).encode() + b'\n'
+
+
+def _iter_history():
+    """Yield history entries oldest-first; peak memory stays O(1).
+
+    Legacy single-document entries come before the JSONL lines so a
+    not-yet-migrated legacy file and new appends read as one history.
+    """
+    if LEGACY_HISTORY_FILE.exists():
+        # Pre-JSONL format: one document with a 'history' list
+        try:
+            data = _read_json(LEGACY_HISTORY_FILE)
+            for entry in data.get('history', []):
+                yield entry
+        except Exception as e:
+            logger.error(f"Error loading legacy history file: {e}")
+    if HISTORY_FILE.exists():
+        with open(HISTORY_FILE, 'rb') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield orjson.loads(line) if orjson is not None else json.loads(line)
+                except Exception as e:
+                    logger.error(f"Skipping corrupt history line: {e}")
+
+
+def _migrate_legacy_history() -> None:
+    """Fold a pre-JSONL history file into the JSONL store, once.
+
+    Legacy entries are prepended ahead of any existing JSONL lines so
+    order is preserved, then the legacy file is removed.
+    """
+    if not LEGACY_HISTORY_FILE.exists():
+        return
+    try:
+        data = _read_json(LEGACY_HISTORY_FILE)
+        legacy = data.get('history', [])
+        existing = HISTORY_FILE.read_bytes() if HISTORY_FILE.exists() else b''
+        with open(HISTORY_FILE, 'wb') as f:
+            for entry in legacy:
+                f.write(_dumps_line(entry))
+            f.write(existing)
+        LEGACY_HISTORY_FILE.unlink()
+        _invalidate_history_caches()
+        logger.info(f"Migrated {len(legacy)} legacy analysis history entries")
+    except Exception as e:
+        logger.error(f"Error migrating legacy history file: {e}")
+
+
+def append_analysis_entry(entry: Dict[str, Any]) -> bool:
+    """
+    Append a single analysis entry to the history file.
+    
+    An O(1) append instead of rewriting the whole history; with one save
+    per analysis this keeps total bytes written linear over a session.
+    
+    Args:
+        entry: Analysis history entry to append
+        
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
+        _migrate_legacy_history()
+        with open(HISTORY_FILE, 'ab') as f:
+            f.write(_dumps_line(entry))
+        _invalidate_history_caches()
+        logger.info("Appended analysis history entry")
+        return True
+    except Exception as e:
+        logger.error(f"Error appending analysis history: {e}")
+        return False
+
 
 def save_analysis_history(history: List[Dict[str, Any]]) -> bool:
     """
-    Save analysis history to file.
+    Rewrite the full analysis history file.
+    
+    Prefer append_analysis_entry for per-analysis saves; this full rewrite
+    is for compaction or bulk replacement.
     
     Args:
         history: List of analysis history entries
@@ -27,13 +158,16 @@ def save_analysis_history(history: List[Dict[str, Any]]) -> bool:
         True if successful, False otherwise
     """
     try:
-        with open(HISTORY_FILE, 'w') as f:
-            json.dump({
-                'history': history,
-                'last_updated': datetime.now().isoformat(),
-                'count': len(history)
-            }, f, indent=2, default=str)
+        with open(HISTORY_FILE, 'wb') as f:
+            for entry in history:
+                f.write(_dumps_line(entry))
+        
+        # The rewrite is authoritative; a leftover legacy file would
+        # duplicate its entries on the next load
+        if LEGACY_HISTORY_FILE.exists():
+            LEGACY_HISTORY_FILE.unlink()
         
+        _invalidate_history_caches()
         logger.info(f"Saved {len(history)} analysis history entries")
         return True
     except Exception as e:
@@ -41,6 +175,10 @@ def save_analysis_history(history: List[Dict[str, Any]]) -> bool:
         return False
 
 
+# Full-rewrite alias kept for compaction call sites
+rewrite_history = save_analysis_history
+
+
 def load_analysis_history() -> List[Dict[str, Any]]:
     """
     Load analysis history from file.
@@ -48,16 +186,21 @@ def load_analysis_history() -> List[Dict[str, Any]]:
     Returns:
         List of analysis history entries
     """
-    if not HISTORY_FILE.exists():
+    global _history_cache
+    
+    if not HISTORY_FILE.exists() and not LEGACY_HISTORY_FILE.exists():
         logger.info("No existing history file found")
         return []
     
     try:
-        with open(HISTORY_FILE, 'r') as f:
-            data = json.load(f)
-            history = data.get('history', [])
-            logger.info(f"Loaded {len(history)} analysis history entries")
-            return history
+        signature = _history_signature()
+        if _history_cache is not None and _history_cache[0] == signature:
+            return list(_history_cache[1])
+        
+        history = list(_iter_history())
+        _history_cache = (signature, history)
+        logger.info(f"Loaded {len(history)} analysis history entries")
+        return list(history)
     except Exception as e:
         logger.error(f"Error loading analysis history: {e}")
         return []
@@ -74,11 +217,10 @@ def save_user_settings(settings: Dict[str, Any]) -> bool:
         True if successful, False otherwise
     """
     try:
-        with open(SETTINGS_FILE, 'w') as f:
-            json.dump({
-                'settings': settings,
-                'last_updated': datetime.now().isoformat()
-            }, f, indent=2)
+        _write_json(SETTINGS_FILE, {
+            'settings': settings,
+            'last_updated': datetime.now().isoformat()
+        })
         
         logger.info("User settings saved")
         return True
@@ -99,11 +241,10 @@ def load_user_settings() -> Dict[str, Any]:
         return {}
     
     try:
-        with open(SETTINGS_FILE, 'r') as f:
-            data = json.load(f)
-            settings = data.get('settings', {})
-            logger.info("User settings loaded")
-            return settings
+        data = _read_json(SETTINGS_FILE)
+        settings = data.get('settings', {})
+        logger.info("User settings loaded")
+        return settings
     except Exception as e:
         logger.error(f"Error loading user settings: {e}")
         return {}
@@ -119,6 +260,9 @@ def clear_analysis_history() -> bool:
     try:
         if HISTORY_FILE.exists():
             HISTORY_FILE.unlink()
+        if LEGACY_HISTORY_FILE.exists():
+            LEGACY_HISTORY_FILE.unlink()
+        _invalidate_history_caches()
         logger.info("Analysis history cleared")
         return True
     except Exception as e:
@@ -133,21 +277,20 @@ def get_history_stats() -> Dict[str, Any]:
     Returns:
         Dictionary with history statistics
     """
-    history = load_analysis_history()
+    global _stats_cache
     
-    if not history:
-        return {
-            'total_analyses': 0,
-            'unique_stocks': set(),
-            'analysis_types': {},
-            'date_range': None
-        }
+    signature = _history_signature()
+    if _stats_cache is not None and _stats_cache[0] == signature:
+        return _stats_cache[1]
     
     unique_stocks = set()
     analysis_types = {}
     dates = []
+    total = 0
     
-    for entry in history:
+    # Stream entries instead of materializing the whole history
+    for entry in _iter_history():
+        total += 1
         # Extract stocks
         stocks_str = entry.get('stocks', '')
         if stocks_str:
@@ -163,13 +306,24 @@ def get_history_stats() -> Dict[str, Any]:
         if timestamp:
             dates.append(timestamp)
     
-    return {
-        'total_analyses': len(history),
-        'unique_stocks': sorted(list(unique_stocks)),
-        'analysis_types': analysis_types,
-        'date_range': {
-            'earliest': min(dates) if dates else None,
-            'latest': max(dates) if dates else None
-        } if dates else None
-    }
+    if not total:
+        stats = {
+            'total_analyses': 0,
+            'unique_stocks': set(),
+            'analysis_types': {},
+            'date_range': None
+        }
+    else:
+        stats = {
+            'total_analyses': total,
+            'unique_stocks': sorted(list(unique_stocks)),
+            'analysis_types': analysis_types,
+            'date_range': {
+                'earliest': min(dates) if dates else None,
+                'latest': max(dates) if dates else None
+            } if dates else None
+        }
+    
+    _stats_cache = (signature, stats)
+    return stats
 
@@ -2,42 +2,104 @@
 Utility functions for the Investment Agent application.
 """
 
+import math
 import yfinance as yf
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Optional, Dict, List
 from datetime import datetime
 from exceptions import DataFetchError
 from cache import cache_manager
 from logger import get_logger
+from validators import validate_symbol_format
+from _fast import HAVE_NUMBA, _batch_stats, _rsi_kernel, _stats_kernel
+import numpy as np
 
 logger = get_logger("utils")
 
+# Disk-cache lifetimes: fundamentals barely move intraday, so .info and
+# validation results survive app restarts for a day, while price-derived
+# indicators stay fresh within 15 minutes
+_INFO_TTL = 86400
+_INDICATOR_TTL = 900
 
-def validate_stock_symbol(symbol: str) -> bool:
+# Magnitude suffix table indexed by digit group: one log10 + lookup
+# replaces the four-deep if/elif ladder in the scalar formatters
+_SUFFIX = (('', 1.0), ('K', 1e3), ('M', 1e6), ('B', 1e9), ('T', 1e12))
+
+# Magnitude bins shared by the vectorized formatter
+_MAGNITUDE_THRESHOLDS = np.array([1e3, 1e6, 1e9, 1e12])
+_MAGNITUDE_DIVISORS = np.array([1.0, 1e3, 1e6, 1e9, 1e12])
+_MAGNITUDE_SUFFIXES = ('', 'K', 'M', 'B', 'T')
+
+
+@lru_cache(maxsize=128)
+def _ticker(symbol: str) -> "yf.Ticker":
+    """Shared yf.Ticker handle per symbol for the life of the process."""
+    return yf.Ticker(symbol)
+
+
+@lru_cache(maxsize=128)
+def _info(symbol: str) -> dict:
+    """Fetch .info once per symbol per session.
+
+    Every call site (validation, risk scoring, summaries) shares this one
+    multi-hundred-KB HTTP fetch instead of refetching independently.
+    Call _info.cache_clear() to force a refetch.
+    """
+    return _ticker(symbol).info
+
+
+def validate_stock_symbol(symbol: str, deep: bool = False) -> bool:
     """
     Validate if a stock symbol exists and is valid.
-    
+
+    Repeat validations within a rerun are served by cache_manager's
+    in-memory layer; fetch errors are deliberately not cached so a
+    transient network failure can't pin a symbol invalid.
+
     Args:
         symbol: Stock ticker symbol to validate
-        
+        deep: Confirm via the full .info payload instead of fast_info
+
     Returns:
         True if valid, False otherwise
     """
     if not symbol or len(symbol) == 0:
         return False
-    
-    # Check cache first
-    cache_key = f"validate_{symbol}"
+
+    # Reject malformed symbols before any network I/O
+    if not validate_symbol_format(symbol):
+        return False
+
+    # Check cache first; tuple keys hash without per-call string building
+    cache_key = ("validate", symbol)
     cached_result = cache_manager.get(cache_key)
     if cached_result is not None:
         return cached_result
-    
+
+    # A cached .info payload already proves the symbol exists; the common
+    # validate-then-fetch path then costs zero extra requests
+    cached_info = cache_manager.get(("stock_info", symbol))
+    if cached_info is not None:
+        is_valid = len(cached_info) > 0 and 'symbol' in cached_info
+        cache_manager.set(cache_key, is_valid, ttl=_INFO_TTL)
+        return is_valid
+
     try:
-        ticker = yf.Ticker(symbol)
-        info = ticker.info
-        # Check if we got valid data (not empty dict)
-        is_valid = info is not None and len(info) > 0 and 'symbol' in info
-        cache_manager.set(cache_key, is_valid)
+        if deep:
+            info = _info(symbol)
+            # Check if we got valid data (not empty dict)
+            is_valid = info is not None and len(info) > 0 and 'symbol' in info
+        else:
+            # fast_info is a sub-KB quote lookup, not the full summary JSON
+            fast = _ticker(symbol).fast_info
+            is_valid = (
+                getattr(fast, 'last_price', None) is not None
+                or getattr(fast, 'market_cap', None) is not None
+            )
+        cache_manager.set(cache_key, is_valid, ttl=_INFO_TTL)
         return is_valid
     except Exception as e:
         logger.debug(f"Validation error for {symbol}: {str(e)}")
@@ -58,16 +120,10 @@ def format_currency(value: Optional[float]) -> str:
         return 'N/A'
     
     try:
-        if abs(value) >= 1_000_000_000_000:
-            return f"${value/1_000_000_000_000:.2f}T"
-        elif abs(value) >= 1_000_000_000:
-            return f"${value/1_000_000_000:.2f}B"
-        elif abs(value) >= 1_000_000:
-            return f"${value/1_000_000:.2f}M"
-        elif abs(value) >= 1_000:
-            return f"${value/1_000:.2f}K"
-        else:
-            return f"${value:.2f}"
+        av = abs(value)
+        idx = 0 if av == 0 else min(4, max(0, int(math.log10(av) // 3)))
+        suffix, divisor = _SUFFIX[idx]
+        return f"${value/divisor:.2f}{suffix}"
     except (TypeError, ValueError):
         return str(value)
 
@@ -99,7 +155,7 @@ def get_stock_info(symbol: str, use_cache: bool = True) -> dict:
     Returns:
         Dictionary containing stock information
     """
-    cache_key = f"stock_info_{symbol}"
+    cache_key = ("stock_info", symbol)
     
     if use_cache:
         cached_info = cache_manager.get(cache_key)
@@ -108,11 +164,13 @@ def get_stock_info(symbol: str, use_cache: bool = True) -> dict:
             return cached_info
     
     try:
-        ticker = yf.Ticker(symbol)
-        info = ticker.info
+        info = _info(symbol)
         
         if use_cache and info:
-            cache_manager.set(cache_key, info)
+            cache_manager.set(cache_key, info, ttl=_INFO_TTL)
+            # Record validity alongside so a later validate_stock_symbol
+            # is answered from cache instead of a second fetch
+            cache_manager.set(("validate", symbol), 'symbol' in info, ttl=_INFO_TTL)
         
         return info
     except Exception as e:
@@ -121,20 +179,17 @@ def get_stock_info(symbol: str, use_cache: bool = True) -> dict:
         raise DataFetchError(error_msg) from e
 
 
-def calculate_risk_score(symbol: str) -> float:
+def calculate_risk_score_from_info(info: dict) -> float:
     """
-    Calculate a simple risk score based on beta and volatility.
+    Calculate a risk score from an already-fetched info dict.
     
     Args:
-        symbol: Stock ticker symbol
+        info: Stock info dictionary containing 'beta'
         
     Returns:
         Risk score from 0-10 (higher = more risky)
     """
     try:
-        ticker = yf.Ticker(symbol)
-        info = ticker.info
-        
         beta = info.get('beta', 1.0)
         if beta is None:
             beta = 1.0
@@ -157,6 +212,25 @@ def calculate_risk_score(symbol: str) -> float:
         return 5.0  # Default moderate risk
 
 
+def calculate_risk_score(symbol: str) -> float:
+    """
+    Calculate a simple risk score based on beta and volatility.
+    
+    Args:
+        symbol: Stock ticker symbol
+        
+    Returns:
+        Risk score from 0-10 (higher = more risky)
+    """
+    try:
+        # Beta only ships in the full .info payload (fast_info has no
+        # beta field); the memoized _info fetch means repeat scorings in
+        # a session cost no extra requests
+        return calculate_risk_score_from_info(_info(symbol))
+    except Exception:
+        return 5.0  # Default moderate risk
+
+
 def format_large_number(value: Optional[float]) -> str:
     """
     Format large numbers with appropriate suffixes.
@@ -171,21 +245,37 @@ def format_large_number(value: Optional[float]) -> str:
         return 'N/A'
     
     try:
-        abs_value = abs(value)
-        if abs_value >= 1_000_000_000_000:
-            return f"{value/1_000_000_000_000:.2f}T"
-        elif abs_value >= 1_000_000_000:
-            return f"{value/1_000_000_000:.2f}B"
-        elif abs_value >= 1_000_000:
-            return f"{value/1_000_000:.2f}M"
-        elif abs_value >= 1_000:
-            return f"{value/1_000:.2f}K"
-        else:
-            return f"{value:.2f}"
+        av = abs(value)
+        idx = 0 if av == 0 else min(4, max(0, int(math.log10(av) // 3)))
+        suffix, divisor = _SUFFIX[idx]
+        return f"{value/divisor:.2f}{suffix}"
     except (TypeError, ValueError):
         return str(value)
 
 
+def format_large_number_array(values) -> List[str]:
+    """
+    Format a whole column of large numbers in one vectorized pass.
+    
+    Classifies every value into its magnitude bin with a single
+    searchsorted call instead of running the per-cell branch chain of
+    format_large_number once per row. Non-numeric entries become 'N/A'.
+    
+    Args:
+        values: Sequence or array of numbers
+        
+    Returns:
+        List of formatted strings, one per input value
+    """
+    arr = pd.to_numeric(pd.Series(values), errors='coerce').to_numpy(dtype=np.float64)
+    idx = np.searchsorted(_MAGNITUDE_THRESHOLDS, np.abs(arr), side='right')
+    scaled = arr / _MAGNITUDE_DIVISORS[idx]
+    return [
+        f"{s:.2f}{_MAGNITUDE_SUFFIXES[i]}" if np.isfinite(v) else 'N/A'
+        for v, s, i in zip(arr, scaled, idx)
+    ]
+
+
 def calculate_volatility(hist_data: pd.DataFrame, period: int = 30) -> float:
     """
     Calculate volatility (standard deviation of returns) for a stock.
@@ -266,49 +356,119 @@ def calculate_rsi(hist_data: pd.DataFrame, period: int = 14) -> float:
         return 50.0  # Neutral RSI
     
     try:
-        delta = hist_data['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        
-        if loss.iloc[-1] == 0:
+        if HAVE_NUMBA:
+            # One fused loop over the raw array, no intermediate Series
+            rsi = _rsi_kernel(hist_data['Close'].to_numpy(dtype=np.float64), period)
+            return round(float(rsi), 2)
+
+        # Only the final value is needed, so compute it from the last
+        # `period` deltas instead of rolling means over the whole series
+        close = hist_data['Close'].to_numpy(dtype=np.float64)
+        delta = np.diff(close[-(period + 1):])
+        avg_gain = np.where(delta > 0, delta, 0.0).mean()
+        avg_loss = np.where(delta < 0, -delta, 0.0).mean()
+
+        if avg_loss == 0:
             return 100.0
-        
-        rs = gain.iloc[-1] / loss.iloc[-1]
+
+        rs = avg_gain / avg_loss
         rsi = 100 - (100 / (1 + rs))
-        return round(rsi, 2)
+        return round(float(rsi), 2)
     except Exception as e:
         logger.error(f"Error calculating RSI: {str(e)}")
         return 50.0
 
 
-def get_technical_indicators(symbol: str, period: str = "6mo") -> Dict[str, float]:
+def _compute_stats(hist: pd.DataFrame) -> Dict[str, float]:
+    """Compute volatility, Sharpe ratio and RSI for a history frame.
+
+    With numba the three indicators come out of one fused pass over the
+    Close array instead of three separate pct_change/rolling chains.
+    """
+    if HAVE_NUMBA and len(hist) >= 2:
+        # The kernel's signature demands C-contiguous float64
+        close = np.ascontiguousarray(hist['Close'].to_numpy(dtype=np.float64))
+        vol, sharpe, rsi = _stats_kernel(close, 14, 30, 0.02 / 252)
+        return {
+            'volatility': round(float(vol), 2),
+            'sharpe_ratio': round(float(sharpe), 2),
+            'rsi': round(float(rsi), 2)
+        }
+    return {
+        'volatility': calculate_volatility(hist),
+        'sharpe_ratio': calculate_sharpe_ratio(hist),
+        'rsi': calculate_rsi(hist)
+    }
+
+
+def compute_stats_batch(closes: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Compute volatility, Sharpe ratio and RSI for many symbols at once.
+    
+    Args:
+        closes: 2D array of shape [n_symbols, n_days] of close prices
+        
+    Returns:
+        Dictionary of 'volatility', 'sharpe_ratio' and 'rsi' arrays,
+        one value per input row
+    """
+    closes = np.ascontiguousarray(closes, dtype=np.float64)
+    if HAVE_NUMBA:
+        # prange kernel: one thread per symbol row, no GIL
+        vol, sharpe, rsi = _batch_stats(closes, 14, 30, 0.02 / 252)
+    else:
+        n = closes.shape[0]
+        vol = np.empty(n)
+        sharpe = np.empty(n)
+        rsi = np.empty(n)
+        for i in range(n):
+            row = pd.DataFrame({'Close': closes[i]})
+            vol[i] = calculate_volatility(row)
+            sharpe[i] = calculate_sharpe_ratio(row)
+            rsi[i] = calculate_rsi(row)
+    return {'volatility': vol, 'sharpe_ratio': sharpe, 'rsi': rsi}
+
+
+def get_technical_indicators(symbol: str, period: str = "6mo",
+                             hist: Optional[pd.DataFrame] = None) -> Dict[str, float]:
     """
     Get technical indicators for a stock.
     
     Args:
         symbol: Stock ticker symbol
         period: Time period for historical data
+        hist: Optional pre-fetched history; skips the per-symbol download
         
     Returns:
         Dictionary with technical indicators
     """
+    cache_key = ("indicators", symbol, period)
+    
     try:
-        ticker = yf.Ticker(symbol)
-        hist = ticker.history(period=period)
+        if hist is None:
+            # Only the self-fetching path caches; callers passing a
+            # pre-fetched frame already amortized the download
+            cached = cache_manager.get(cache_key)
+            if cached is not None:
+                return cached
+            ticker = yf.Ticker(symbol)
+            hist = ticker.history(period=period)
+            fetched = True
+        else:
+            fetched = False
         
         if hist.empty:
             return {}
         
-        indicators = {
-            'volatility': calculate_volatility(hist),
-            'sharpe_ratio': calculate_sharpe_ratio(hist),
-            'rsi': calculate_rsi(hist),
-            'current_price': float(hist['Close'].iloc[-1]),
-            'price_change_pct': calculate_percentage_change(
-                hist['Close'].iloc[0],
-                hist['Close'].iloc[-1]
-            )
-        }
+        indicators = _compute_stats(hist)
+        indicators['current_price'] = float(hist['Close'].iloc[-1])
+        indicators['price_change_pct'] = calculate_percentage_change(
+            hist['Close'].iloc[0],
+            hist['Close'].iloc[-1]
+        )
+        
+        if fetched:
+            cache_manager.set(cache_key, indicators, ttl=_INDICATOR_TTL)
         
         return indicators
     except Exception as e:
@@ -326,14 +486,35 @@ def compare_stocks_metrics(stocks: List[str]) -> pd.DataFrame:
     Returns:
         DataFrame with comparison metrics
     """
-    comparison_data = []
+    # Nothing to compare; also keeps ThreadPoolExecutor's max_workers > 0
+    if not stocks:
+        return pd.DataFrame()
+
+    # One batched request for all symbols instead of 3+ HTTP round-trips
+    # per ticker; the per-symbol work below runs mostly in memory
+    try:
+        tickers = yf.Tickers(" ".join(stocks))
+        hist = yf.download(stocks, period="6mo", group_by='ticker',
+                           threads=True, progress=False)
+    except Exception as e:
+        logger.error(f"Error batch-fetching stock data: {str(e)}")
+        tickers, hist = None, None
     
-    for symbol in stocks:
+    def _row(symbol: str) -> Optional[Dict]:
         try:
-            info = get_stock_info(symbol)
-            indicators = get_technical_indicators(symbol)
+            if tickers is not None:
+                info = tickers.tickers[symbol.upper()].info
+            else:
+                info = get_stock_info(symbol)
+            
+            sub_hist = None
+            if hist is not None and not hist.empty:
+                # yf.download uppercases the ticker column keys and keeps
+                # the ticker level even for a single symbol under group_by
+                sub_hist = hist[symbol.upper()].dropna(how='all')
+            indicators = get_technical_indicators(symbol, hist=sub_hist)
             
-            stock_data = {
+            return {
                 'Symbol': symbol,
                 'Current Price': info.get('currentPrice', info.get('regularMarketPrice', 'N/A')),
                 'Market Cap': info.get('marketCap', 'N/A'),
@@ -342,35 +523,48 @@ def compare_stocks_metrics(stocks: List[str]) -> pd.DataFrame:
                 'Beta': info.get('beta', 'N/A'),
                 'Volatility': indicators.get('volatility', 'N/A'),
                 'RSI': indicators.get('rsi', 'N/A'),
-                'Risk Score': calculate_risk_score(symbol)
+                # Score from the info dict already in hand; no refetch
+                'Risk Score': calculate_risk_score_from_info(info)
             }
-            
-            comparison_data.append(stock_data)
         except Exception as e:
             logger.error(f"Error comparing stock {symbol}: {str(e)}")
-            continue
+            return None
+    
+    # Remaining per-symbol fetches (lazy .info, fallbacks) are I/O bound,
+    # so threads overlap the HTTPS latency; map() keeps submission order
+    with ThreadPoolExecutor(max_workers=min(10, len(stocks))) as executor:
+        comparison_data = [row for row in executor.map(_row, stocks) if row is not None]
     
-    return pd.DataFrame(comparison_data)
+    df = pd.DataFrame(comparison_data)
+    if not df.empty and 'Market Cap' in df.columns:
+        # Format the whole column at once rather than per cell
+        df['Market Cap'] = format_large_number_array(df['Market Cap'])
+    return df
 
 
-def normalize_stock_data(hist_data: pd.DataFrame) -> pd.DataFrame:
+def normalize_stock_data(hist_data: pd.DataFrame,
+                         columns: Optional[tuple] = None) -> pd.DataFrame:
     """
     Normalize stock price data to start at 100 for easier comparison.
-    
+
     Args:
         hist_data: Historical price data DataFrame
-        
+        columns: Optional projection; when given, only these columns are
+            carried into the result. By default the full column set is
+            kept with Close normalized
+
     Returns:
         Normalized DataFrame
     """
     if hist_data.empty:
         return hist_data
-    
+
     try:
-        normalized = hist_data.copy()
-        first_price = normalized['Close'].iloc[0]
-        normalized['Close'] = (normalized['Close'] / first_price) * 100
-        return normalized
+        # assign() shares the untouched column blocks; only the new
+        # Close array is allocated, instead of copy() plus overwrite
+        close = hist_data['Close'].to_numpy(dtype=np.float64)
+        normalized = hist_data.assign(Close=close * (100.0 / close[0]))
+        return normalized[list(columns)] if columns is not None else normalized
     except Exception as e:
         logger.error(f"Error normalizing stock data: {str(e)}")
         return hist_data
@@ -9,6 +9,10 @@ from logger import get_logger
 
 logger = get_logger("validators")
 
+# Stock symbols are typically 1-5 uppercase letters, sometimes with dots
+# or hyphens; compiled once instead of per call
+_SYMBOL_RE = re.compile(r'^[A-Z]{1,5}(\.[A-Z]+)?(-[A-Z]+)?$')
+
 
 def validate_symbol_format(symbol: str) -> bool:
     """
@@ -23,9 +27,29 @@ def validate_symbol_format(symbol: str) -> bool:
     if not symbol or not isinstance(symbol, str):
         return False
     
-    # Stock symbols are typically 1-5 uppercase letters, sometimes with dots or hyphens
-    pattern = r'^[A-Z]{1,5}(\.[A-Z]+)?(-[A-Z]+)?$'
-    return bool(re.match(pattern, symbol.upper()))
+    # Cheap rejects before entering the regex engine
+    if len(symbol) > 10 or not symbol.isascii():
+        return False
+    
+    return bool(_SYMBOL_RE.match(symbol.upper()))
+
+
+def validate_symbols_bulk(symbols: List[str]) -> List[bool]:
+    """
+    Validate the format of many symbols in one pass.
+    
+    Args:
+        symbols: List of stock symbols
+        
+    Returns:
+        List of booleans, one per symbol, in input order
+    """
+    match = _SYMBOL_RE.match
+    return [
+        bool(isinstance(s, str) and s and len(s) <= 10 and s.isascii()
+             and match(s.upper()))
+        for s in symbols
+    ]
 
 
 def validate_api_key(api_key: str) -> bool: